@@ -0,0 +1,166 @@
+from playwright.async_api import async_playwright
+import asyncio
+import json
+import os
+import random
+
+from extractor import extract_detail_async
+from main import (
+    CONTEXT_OPTIONS, COOKIES_FILE, SEARCH_URL,
+    parse_meta_text, record_job, load_job_data, save_job_data,
+)
+from waits import (
+    WAIT_STATS, count_cards_async, wait_for_card_growth_async,
+    get_selected_page_async, wait_for_page_change_async,
+)
+
+# Concurrent scraping mode: the search page only collects job ids, and the
+# job-detail extraction is fanned out over a bounded pool of tabs that share
+# one persistent context (same cookies / login session).
+
+async def load_cookies_async(context):
+    if os.path.exists(COOKIES_FILE):
+        with open(COOKIES_FILE, "r") as f:
+            await context.add_cookies(json.load(f))
+        print("✅ Cookies loaded successfully.")
+    else:
+        print("❌ Cookies file not found.")
+
+# Same readiness checks as the sync path (waits.py): card-count growth after a
+# scroll step, selected page change after pagination, short fixed fallbacks.
+
+async def scroll_job_list_async(page, max_time=5):
+    for i in range(max_time):
+        job_list_container = await page.query_selector("div.scaffold-layout__list")
+        if not job_list_container:
+            print("⚠️ Couldn't find job list container!")
+            return
+        box = await job_list_container.bounding_box()
+        if box:
+            previous_count = await count_cards_async(page)
+            await page.mouse.move(box['x'] + box['width'] / 2, box['y'] + box['height'] / 2)
+            await page.mouse.wheel(0, 800)
+            await wait_for_card_growth_async(page, previous_count)
+        else:
+            await page.wait_for_timeout(2000)
+
+async def go_to_next_page_async(page):
+    next_button = await page.query_selector("li.artdeco-pagination__indicator--number.selected + li")
+    if next_button and await next_button.is_visible():
+        current_page = await get_selected_page_async(page)
+        await next_button.click()
+        await wait_for_page_change_async(page, current_page)
+        return True
+    return False
+
+async def collect_job_ids(page, max_jobs):
+    """Walk the search result pages and return up to max_jobs unique job ids, in list order."""
+    job_ids = []
+    seen = set()
+    while len(job_ids) < max_jobs:
+        await scroll_job_list_async(page)
+        card_ids = await page.eval_on_selector_all(
+            '.job-card-container',
+            "cards => cards.map(c => c.getAttribute('data-job-id'))"
+        )
+        for job_id in card_ids:
+            if job_id and job_id not in seen:
+                seen.add(job_id)
+                job_ids.append(job_id)
+                if len(job_ids) >= max_jobs:
+                    break
+        if len(job_ids) < max_jobs and not await go_to_next_page_async(page):
+            print("⚠️ No more pages to scrape.")
+            break
+    return job_ids
+
+async def extract_job_detail(page, job_id):
+    """Open the job view page in a tab and return the fields used by record_job."""
+    link = f"/jobs/view/{job_id}/"
+    await page.goto(f"https://www.linkedin.com{link}", wait_until="domcontentloaded")
+    await page.wait_for_selector("h1", timeout=15000)
+
+    detail = await extract_detail_async(page)
+    exact_date, applicants = parse_meta_text(detail["meta"])
+    job_title, company, description = detail["title"], detail["company"], detail["description"]
+
+    return job_title, link, company, exact_date, description, applicants
+
+async def scrape_with_descriptions_async(job_dict=None, query="data analyst", location="Singapore",
+                                         max_jobs=25, concurrency=4, delay=1.5, jitter=1.0):
+    """
+    Async counterpart of main.login_and_scrape_with_descriptions.
+
+    concurrency: number of detail tabs working in parallel.
+    delay / jitter: politeness pause (seconds) each tab takes after a job, delay + uniform(0, jitter).
+    """
+    if job_dict is None:
+        job_dict = {}
+
+    async with async_playwright() as p:
+        context = await p.chromium.launch_persistent_context(**CONTEXT_OPTIONS)
+        page = context.pages[0] if context.pages else await context.new_page()
+        await load_cookies_async(context)
+
+        search_url = SEARCH_URL.format(query=query, location=location)
+        print(f"🔍 Navigating to: {search_url}")
+        await page.goto(search_url, wait_until="networkidle")
+
+        if await page.is_visible("div.sign-in-modal"):
+            print("❌ Need login!")
+            await context.close()
+            return None
+        print("login success! ")
+
+        await page.wait_for_selector('.job-card-container')
+        job_ids = await collect_job_ids(page, max_jobs)
+        print(f"Collected {len(job_ids)} job ids, extracting with {concurrency} tabs")
+
+        # Bounded tab pool: a job waits until one of the tabs is free
+        tabs = asyncio.Queue()
+        for _ in range(max(1, concurrency)):
+            await tabs.put(await context.new_page())
+
+        async def worker(job_id):
+            tab = await tabs.get()
+            try:
+                fields = await extract_job_detail(tab, job_id)
+                job_title, link, company, exact_date, description, applicants = fields
+                record_job(job_dict, job_id, job_title, link, company,
+                           exact_date, description, applicants, query)
+                print(f"id: {job_id} | {job_title}")
+            except Exception as e:
+                print(f"⚠️ Error scraping job {job_id}: {e}")
+            finally:
+                await asyncio.sleep(delay + random.uniform(0, jitter))
+                await tabs.put(tab)
+
+        await asyncio.gather(*(worker(job_id) for job_id in job_ids))
+        await context.close()
+
+    WAIT_STATS.print_report()
+
+    return job_dict
+
+def login_and_scrape_concurrent(job_dict={}, query="data analyst", location="Singapore", max_jobs=25, **kwargs):
+    """Sync entry point with the same signature as main.login_and_scrape_with_descriptions."""
+    return asyncio.run(scrape_with_descriptions_async(job_dict, query, location, max_jobs, **kwargs))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape LinkedIn jobs with a pool of concurrent tabs')
+    parser.add_argument('--input', type=str, default='job_data_0414.json', help='Previous job data JSON file')
+    parser.add_argument('--output', type=str, default='job_data_0421.json', help='Output job data JSON file')
+    parser.add_argument('--query', type=str, default='Data Science')
+    parser.add_argument('--location', type=str, default='Singapore')
+    parser.add_argument('--max-jobs', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4, help='Number of detail tabs')
+    parser.add_argument('--delay', type=float, default=1.5, help='Per-tab pause after each job (seconds)')
+    args = parser.parse_args()
+
+    job_dict, seen_job_ids = load_job_data(args.input)
+    login_and_scrape_concurrent(job_dict, query=args.query, location=args.location, max_jobs=args.max_jobs,
+                                concurrency=args.concurrency, delay=args.delay)
+    save_job_data(args.output, job_dict)
@@ -1,21 +1,17 @@
-import numpy as np
 import json
-from transformers import pipeline
 from collections import Counter
 import os
 import re
-import spacy
-from spacy.matcher import PhraseMatcher
-
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer, PorterStemmer
-from nltk.tokenize import word_tokenize
 import gc
 
-nlp = spacy.load("en_core_web_lg")
-stop_words = set(stopwords.words('english'))
-# token_skill_classifier = pipeline(model="jjzha/jobbert_skill_extraction", aggregation_strategy="first")
-# token_knowledge_classifier = pipeline(model="jjzha/jobbert_knowledge_extraction", aggregation_strategy="first")
+from dedupe import SentenceSet
+from description import load_classified
+from inference_cache import cached_map, get_inference_cache
+from models import get_spacy, get_stop_words, get_hf_pipeline, spacy_model_name
+from skill_matcher import get_skill_matcher
+
+# Models are loaded on first use through the models registry, so data prep
+# (create_baseline_file, get_requirement) never pays for spaCy / transformers.
 
 
 ##NLP
@@ -27,11 +23,10 @@ def clean_sentence(sentence):
     return sentence
 
 
-def extract_skill_keywords(sentence, min_words=1, max_words=4):
-    sentence = clean_sentence(sentence)
-    doc = nlp(sentence)
+def _skill_keywords_from_doc(doc, min_words=1, max_words=4):
     skills = []
 
+    stop_words = get_stop_words()
     for chunk in doc.noun_chunks:
         tokens = [token for token in chunk if token.text.lower() not in stop_words]
 
@@ -51,17 +46,33 @@ def extract_skill_keywords(sentence, min_words=1, max_words=4):
 
     return list(set(skills))
 
+def extract_skill_keywords_batch(sentences, min_words=1, max_words=4, batch_size=256, n_process=1):
+    """
+    Batched extract_skill_keywords over nlp.pipe (the "keywords" model is loaded without NER).
+    Results are memoized per clean_sentence() in the inference cache.
+    """
+    def compute(batch):
+        cleaned = (clean_sentence(sentence) for sentence in batch)
+        docs = get_spacy("keywords").pipe(cleaned, batch_size=batch_size, n_process=n_process)
+        return [_skill_keywords_from_doc(doc, min_words, max_words) for doc in docs]
+
+    version = f"{spacy_model_name('keywords')}:{min_words}-{max_words}"
+    return cached_map("skill_keywords", version, sentences, compute, normalize=clean_sentence)
+
+def extract_skill_keywords(sentence, min_words=1, max_words=4):
+    return extract_skill_keywords_batch([sentence], min_words, max_words)[0]
+
 
 ## model
 
 def ner(text):
 
     # Get skill predictions
-    output_skills = token_skill_classifier(text)
+    output_skills = get_hf_pipeline("skill")(text)
     skill_words = [result["word"] for result in output_skills if "word" in result]
 
     # Get knowledge predictions
-    output_knowledge = token_knowledge_classifier(text)
+    output_knowledge = get_hf_pipeline("knowledge")(text)
     knowledge_words = [result["word"] for result in output_knowledge if "word" in result]
 
 
@@ -76,12 +87,12 @@ HARD_SKILL_LIST = [
     "Natural Language Processing", "Machine Learning", "Data Analysis", "Deep Learning"
 ]
 
-# Build phrase matcher
-phrase_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-patterns = [nlp.make_doc(skill) for skill in HARD_SKILL_LIST]
-phrase_matcher.add("HARD_SKILL", patterns)
+# Hard skills are matched with skill_matcher (Aho-Corasick over the raw string,
+# aliases mapped to canonical names): HARD_SKILL_LIST + DEFAULT_ALIASES, or the
+# taxonomy file named by SKILL_TAXONOMY
 
-# Negation phrases
+# Negation phrases for the sentence-level contains_negation check. extract_hard_skills
+# labels each skill instead (skill_matcher.CUES): required / optional / negated
 NEGATION_PATTERNS = [
     r'\bnot required\b',
     r'\bno experience\b',
@@ -92,32 +103,44 @@ NEGATION_PATTERNS = [
     r'\bnice to have\b'
 ]
 
+NEGATION_PATTERN = re.compile("|".join(NEGATION_PATTERNS), re.IGNORECASE)
+
 def contains_negation(sentence):
-    sentence_lower = sentence.lower()
-    return any(re.search(pattern, sentence_lower) for pattern in NEGATION_PATTERNS)
+    return NEGATION_PATTERN.search(sentence) is not None
+
+def extract_hard_skills_labeled_batch(sentences):
+    """
+    {skill: "required" | "optional" | "negated"} per sentence, matched once per distinct sentence.
+    Not disk-cached: the matcher is cheaper than an inference cache round trip. Keyed on the
+    exact sentence, since short aliases ("R", "ML") are case-sensitive.
+    """
+    matcher = get_skill_matcher()
+    sentences = SentenceSet(sentences)
+    labeled = [matcher.labeled_skills(sentence) for sentence in sentences.unique]
+    return [dict(labels) for labels in sentences.scatter(labeled)]  # duplicates get their own dict
+
+def extract_hard_skills_labeled(sentence):
+    return extract_hard_skills_labeled_batch([sentence])[0]
+
+def extract_hard_skills_batch(sentences):
+    """Required and optional hard skills per sentence; negated mentions ("no experience with X") are dropped."""
+    return [[skill for skill, label in labeled.items() if label != "negated"]
+            for labeled in extract_hard_skills_labeled_batch(sentences)]
 
 def extract_hard_skills(sentence):
-    skills_found = set()
-    doc = nlp(sentence)
-
-    if contains_negation(sentence):
-        return []  # Skip extraction in negated contexts
-
-    matches = phrase_matcher(doc)
-    for match_id, start, end in matches:
-        skill = doc[start:end].text.strip()
-        skills_found.add(skill)
+    return extract_hard_skills_batch([sentence])[0]
 
-    return list(skills_found)
 
-
-def get_requirement(job_data):
+def get_requirement(job_data, distinct=False):
+    """Requirements + Preferred lines of every job; distinct=True drops repeated lines (first occurrence kept)."""
     combined_lines = []
     for job in job_data:
         reqs = job.get("Requirements", [])
         prefs = job.get("Preferred / Nice to Have", [])
         combined_lines.extend(reqs)
         combined_lines.extend(prefs)
+    if distinct:
+        return SentenceSet(combined_lines).unique
     return combined_lines    
 
 def save_to_json(data, filename="sentences.json", length = 100):
@@ -150,19 +173,18 @@ def check_file_exist(filename):
         return filename
     return new_filename
 
-def create_baseline_file(inpu_file,output_file,length=100):
-    
-    with open(inpu_file, "r", encoding="utf-8") as f:
-        job_data = json.load(f)
+def create_baseline_file(inpu_file,output_file,length=100,distinct=False):
+    """distinct=True samples from distinct lines only (changes the annotation sample)."""
+    job_data = load_classified(inpu_file)
     output_file = check_file_exist(output_file)
-    sentences = get_requirement(job_data) 
+    sentences = get_requirement(job_data, distinct=distinct)
     save_to_json(sentences,filename=output_file,length=length)   
 
 
 
 if __name__ == '__main__':
     
-    inpu_file="job_data_0414_classify.json"
+    inpu_file="job_data_0414_classify.jsonl"
     output_file="baseline_sentences.json"
     comparsion_file = "compare_rule_based.json"
     # create_baseline_file(inpu_file,output_file,length=100)
@@ -174,27 +196,28 @@ if __name__ == '__main__':
     print("baseline loaded")
 
     all_results = []
+    sentences = [entry["sentence"] for entry in baseline_data]
+    # nlp_results = extract_skill_keywords_batch(sentences)
+    rule_labels = extract_hard_skills_labeled_batch(sentences)
 
-    for entry in baseline_data:
+    for entry, labels in zip(baseline_data, rule_labels):
         sentence = entry["sentence"]
         ground_truth = entry["hard_skill"]
-        # nlp_result = extract_skill_keywords(sentence)
         # model_result = ner(sentence )
-        rule_result = extract_hard_skills(sentence)
-
-        if(len(all_results)%10==0):
-            print(len(all_results))
 
         all_results.append({
             "sentence": sentence,
             "ground_truth": ground_truth,
-            "rule_result": rule_result
+            "rule_result": [skill for skill, label in labels.items() if label != "negated"],
+            "rule_labels": labels
             # "nlp_result": nlp_result,
             # "model_result": model_result
         })
 
     with open(comparsion_file, 'w', encoding='utf-8') as f:
         json.dump(all_results, f, indent=2, ensure_ascii=False)
+    if get_inference_cache():
+        get_inference_cache().print_stats()
 
     del baseline_data, all_results
     gc.collect()
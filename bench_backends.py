@@ -0,0 +1,82 @@
+import json
+import os
+import time
+from collections import Counter
+
+os.environ["INFERENCE_CACHE"] = ""  # measure inference, not cache hits; read when hf imports the cache
+
+from bench_extraction import make_synthetic_corpus
+from dedupe import SentenceSet
+from evaluate_extraction import compute_metrics
+from hf import ner_batch, ThroughputReporter, examples
+from models import HF_BACKENDS, get_hf_pipeline
+
+# Latency / throughput benchmark of the JobBERT backends, with a parity check:
+# each backend's extracted spans are scored against the fp32 "torch" output
+# with the same span overlap evaluate_extraction.py uses.
+# ner_batch runs each distinct sentence once, so the corpus is deduplicated up
+# front and throughput is per distinct sentence the model actually saw.
+
+def span_words(result):
+    return [r["word"] for r in result["skills"]] + [r["word"] for r in result["knowledge"]]
+
+def run_backend(backend, sentences, batch_size):
+    start = time.perf_counter()
+    get_hf_pipeline("skill", backend)
+    get_hf_pipeline("knowledge", backend)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = ner_batch(sentences, Counter(), Counter(), batch_size=batch_size, backend=backend,
+                        reporter=ThroughputReporter(len(sentences), every=60))
+    elapsed = time.perf_counter() - start
+    return results, load_s, elapsed
+
+def parity(results, reference):
+    tp = fp = fn = 0
+    for result, ref in zip(results, reference):
+        _, _, _, t, p, n = compute_metrics(span_words(result), span_words(ref))
+        tp, fp, fn = tp + t, fp + p, fn + n
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark JobBERT inference backends')
+    parser.add_argument('--input', type=str, default=None, help='baseline_sentences.json style file')
+    parser.add_argument('--synthetic', type=int, default=500, help='synthetic corpus size when no --input')
+    parser.add_argument('--backends', nargs='+', default=HF_BACKENDS, choices=HF_BACKENDS)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--output', type=str, default='backend_benchmark.json')
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            sentences = [entry["sentence"] for entry in json.load(f)]
+    else:
+        sentences = examples + [entry["sentence"] for entry in make_synthetic_corpus(args.synthetic)]
+    sentences = SentenceSet(sentences).unique
+    print(f"Benchmarking on {len(sentences)} distinct sentences")
+
+    report = {}
+    reference = None
+    for backend in ["torch"] + [b for b in args.backends if b != "torch"]:
+        results, load_s, elapsed = run_backend(backend, sentences, args.batch_size)
+        if reference is None:
+            reference = results
+        report[backend] = {
+            "load_s": round(load_s, 2),
+            "sentences": len(sentences),
+            "total_s": round(elapsed, 2),
+            "sentences_per_s": round(len(sentences) / elapsed, 1),
+            "ms_per_sentence": round(elapsed / len(sentences) * 1000, 2),
+            "parity_f1_vs_torch": round(parity(results, reference), 4),
+        }
+        print(backend, report[backend])
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark saved to {args.output}")
@@ -0,0 +1,193 @@
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime
+
+# Speed + accuracy benchmark of the three skill extractors.
+#
+# Each extractor runs in a fresh (spawned) process over a labelled corpus in
+# the baseline_sentences.json format, so model load time and peak RSS are its
+# own. Reported per extractor: load time, per-sentence latency (p50/p95/mean),
+# batched throughput, peak RSS, and micro/macro F1 against "hard_skill" via
+# evaluate_extraction. The inference cache is disabled so every run computes.
+# rule and jobbert dedupe sentences inside their batch functions and keywords
+# does not, so batched throughput is measured on the distinct sentences only,
+# the same set for every extractor.
+# Results go to a JSON file; --compare prints deltas against an earlier one.
+
+EXTRACTORS = ["rule", "keywords", "jobbert"]
+
+TEMPLATES = [
+    ("Strong experience with {0} and {1}.", True),
+    ("3+ years of hands-on {0} development", True),
+    ("Proficiency in {0}, {1} or {2} is required", True),
+    ("Familiarity with {0} is a plus", True),
+    ("Build and maintain {0} pipelines on {1}", True),
+    ("Knowledge of {0} is nice to have", True),
+    ("No experience with {0} required", False),
+]
+FILLER = [
+    "Excellent communication skills", "Bachelor's degree in Computer Science or a related field",
+    "Ability to work in a fast-paced environment", "Strong problem-solving skills",
+]
+
+def make_synthetic_corpus(n=500, seed=0):
+    """baseline_sentences.json-style entries built from HARD_SKILL_LIST; negated mentions are unlabelled."""
+    from baseline import HARD_SKILL_LIST
+
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        if rng.random() < 0.15:
+            sentence, labelled, skills = rng.choice(FILLER), True, []
+        else:
+            template, labelled = rng.choice(TEMPLATES)
+            skills = rng.sample(HARD_SKILL_LIST, 3)[:template.count("{")]
+            sentence = template.format(*skills)
+        corpus.append({"sentence": sentence, "hard_skill": skills if labelled else [],
+                       "soft_skill": [], "qualification": []})
+    return corpus
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load(name):
+    if name == "rule":
+        from skill_matcher import get_skill_matcher
+        get_skill_matcher()
+    elif name == "keywords":
+        from models import get_spacy, get_stop_words
+        get_spacy("keywords")
+        get_stop_words()
+    else:
+        from models import get_hf_pipeline
+        get_hf_pipeline("skill")
+        get_hf_pipeline("knowledge")
+
+def _functions(name):
+    """(single-sentence fn, batch fn), both returning skill strings."""
+    if name == "rule":
+        from baseline import extract_hard_skills, extract_hard_skills_batch
+        return extract_hard_skills, extract_hard_skills_batch
+    if name == "keywords":
+        from baseline import extract_skill_keywords, extract_skill_keywords_batch
+        return extract_skill_keywords, extract_skill_keywords_batch
+    from hf import ner, ner_batch, ThroughputReporter
+
+    def words(result):
+        return [r["word"] for r in result["skills"]] + [r["word"] for r in result["knowledge"]]
+    single = lambda sentence: words(ner(sentence, Counter(), Counter()))
+    batch = lambda sentences: [words(r) for r in ner_batch(
+        sentences, Counter(), Counter(), reporter=ThroughputReporter(len(sentences), every=60))]
+    return single, batch
+
+def run_extractor(name, sentences):
+    """Runs in a spawned worker: returns timings, peak RSS and per-sentence predictions."""
+    import numpy as np
+
+    start = time.perf_counter()
+    _load(name)
+    load_s = time.perf_counter() - start
+    single, batch = _functions(name)
+
+    latencies, predictions = [], []
+    for sentence in sentences:
+        start = time.perf_counter()
+        predictions.append(single(sentence))
+        latencies.append(time.perf_counter() - start)
+
+    from dedupe import SentenceSet
+
+    distinct = SentenceSet(sentences).unique
+    start = time.perf_counter()
+    batch(distinct)
+    batch_s = time.perf_counter() - start
+
+    latencies = np.asarray(latencies) * 1000
+    return {
+        "load_s": round(load_s, 3),
+        "latency_ms": {"p50": round(float(np.percentile(latencies, 50)), 3),
+                       "p95": round(float(np.percentile(latencies, 95)), 3),
+                       "mean": round(float(latencies.mean()), 3)},
+        "single_sentences_per_s": round(len(sentences) / (latencies.sum() / 1000), 1),
+        "batch_sentences": len(distinct),
+        "batch_sentences_per_s": round(len(distinct) / batch_s, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }, predictions
+
+def _init_worker():
+    os.environ["INFERENCE_CACHE"] = ""  # measure computation, not cache hits
+
+def accuracy(corpus, predictions, name):
+    from evaluate_extraction import Evaluation
+
+    method = f"{name}_result"
+    entries = ({"ground_truth": entry["hard_skill"], method: preds} for entry, preds in zip(corpus, predictions))
+    summary = Evaluation(entries, [method]).summary(method)
+    return {key: round(summary[key], 4) for key in ("micro_precision", "micro_recall", "micro_f1", "macro_f1")}
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def compare(report, previous):
+    for name, row in report["extractors"].items():
+        old = previous.get("extractors", {}).get(name)
+        if not old:
+            continue
+        deltas = [f"{key} {old[key]} -> {row[key]} ({(row[key] - old[key]) / old[key]:+.0%})"
+                  for key in ("batch_sentences_per_s", "peak_rss_mb", "load_s") if old.get(key)]
+        deltas.append(f"micro_f1 {old['micro_f1']} -> {row['micro_f1']}")
+        print(f"{name}: " + ", ".join(deltas))
+
+
+if __name__ == '__main__':
+    import argparse
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description='Benchmark skill extractors on speed and accuracy')
+    parser.add_argument('--input', type=str, default=None, help='baseline_sentences.json style corpus')
+    parser.add_argument('--synthetic', type=int, default=500, help='synthetic corpus size when no --input')
+    parser.add_argument('--write-corpus', type=str, default=None, help='save the synthetic corpus here')
+    parser.add_argument('--extractors', nargs='+', default=EXTRACTORS, choices=EXTRACTORS)
+    parser.add_argument('--output', type=str, default='extraction_benchmark.json')
+    parser.add_argument('--compare', type=str, default=None, help='earlier benchmark JSON to diff against')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.input) if args.input else make_synthetic_corpus(args.synthetic)
+    if args.write_corpus:
+        with open(args.write_corpus, "w", encoding="utf-8") as f:
+            json.dump(corpus, f, indent=2, ensure_ascii=False)
+    sentences = [entry["sentence"] for entry in corpus]
+    print(f"Benchmarking {args.extractors} on {len(sentences)} sentences")
+
+    report = {
+        "meta": {"created": datetime.now().isoformat(timespec="seconds"), "git": git_revision(),
+                 "python": platform.python_version(), "corpus": args.input or f"synthetic:{args.synthetic}",
+                 "sentences": len(sentences)},
+        "extractors": {},
+    }
+    context = multiprocessing.get_context("spawn")
+    for name in args.extractors:
+        with context.Pool(1, initializer=_init_worker) as pool:
+            row, predictions = pool.apply(run_extractor, (name, sentences))
+        row.update(accuracy(corpus, predictions, name))
+        report["extractors"][name] = row
+        print(f"🏁 {name}: {json.dumps(row)}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
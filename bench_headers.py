@@ -0,0 +1,76 @@
+import json
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from description import normalize_section_name, iter_descriptions
+
+# Benchmark: compiled + memoized normalize_section_name vs the original
+# substring-scan version, over the header strings of our job corpus.
+
+def legacy_normalize_section_name(raw_header: str) -> str:
+    text = re.sub(r'[^\w\s]', '', raw_header.strip().lower())
+    if any(x in text for x in ["responsibilit", "what will you", "in this role"]):
+        return "Responsibilities"
+    if any(x in text for x in ["requirement", "qualificat", "what you need", "skill", "minimum qualificat",
+                               "preferred qualificat", "experience", "certification"]):
+        return "Requirements"
+    if any(x in text for x in ["job description", "your role", "what you can expect", "what the role is", "overview"]):
+        return "Job Description"
+    if any(x in text for x in ["bonuses", "good to have"]):
+        return "Preferred / Nice to Have"
+    if any(x in text for x in ["about the job", "why join", "who are we", "company"]):
+        return "Company Info"
+    return "Other"
+
+SAMPLE_HEADERS = [
+    "About the job", "Responsibilities:", "Key Responsibilities", "Requirements", "Qualifications",
+    "What you need to succeed", "Skills & Experience", "Good to have", "Why join us?", "Job Description",
+    "What will you do", "Who are we", "Benefits", "Minimum Qualifications", "Overview", "Your role",
+    "Company experience and culture", "In this role you will", "Perks", "Preferred Qualifications",
+]
+
+def corpus_headers(input_file):
+    headers = []
+    for _, html in iter_descriptions(input_file):
+        soup = BeautifulSoup(html, "html.parser")
+        headers.extend(tag.get_text(strip=True) for tag in soup.find_all(["strong", "b", "h2", "h3", "h4"]))
+    return [h for h in headers if h and len(h) < 60]
+
+def time_it(fn, headers, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for header in headers:
+            fn(header)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the section header classifier')
+    parser.add_argument('--input', type=str, default=None, help='job data (JSON/JSONL/.db) to take headers from')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    headers = corpus_headers(args.input) if args.input else SAMPLE_HEADERS * 500
+    mismatches = [h for h in set(headers) if normalize_section_name(h) != legacy_normalize_section_name(h)]
+    print(f"{len(headers)} headers ({len(set(headers))} unique), {len(mismatches)} mismatches")
+    for h in mismatches[:10]:
+        print(f"   {h!r}: {legacy_normalize_section_name(h)} -> {normalize_section_name(h)}")
+
+    legacy = time_it(legacy_normalize_section_name, headers, args.repeat)
+    normalize_section_name.cache_clear()
+    compiled = time_it(normalize_section_name.__wrapped__, headers, args.repeat)
+    normalize_section_name.cache_clear()
+    memoized = time_it(normalize_section_name, headers, args.repeat)
+    n = len(headers) * args.repeat
+    results = {
+        "headers": n,
+        "legacy_us": legacy / n * 1e6,
+        "compiled_us": compiled / n * 1e6,
+        "compiled_memoized_us": memoized / n * 1e6,
+    }
+    print(json.dumps(results, indent=2))
+    print(f"Speedup: {legacy / compiled:.1f}x compiled, {legacy / memoized:.1f}x memoized")
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+
+# Import-time benchmark: wall time of a fresh `import <module>` per script,
+# so data-prep CLIs stay well under a second (models load lazily, see models.py).
+
+MODULES = ["description", "baseline", "analysis", "hf", "evaluate_extraction", "models"]
+
+def import_time(module, repeat=3):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best, None
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure module import time')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=str, default=None, help='Optional JSON results file')
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        elapsed, error = import_time(module, args.repeat)
+        results[module] = elapsed
+        if error:
+            print(f"{module}: failed ({error})")
+        else:
+            print(f"{module}: {elapsed * 1000:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,180 @@
+import re
+import zlib
+from collections import Counter
+
+# Sentence deduplication for the extraction pipelines.
+#
+# Requirement lines repeat across postings (boilerplate, reposts, the same
+# employer hiring for several roles). SentenceSet keeps each distinct sentence
+# once, under a key function, together with its multiplicity, so extraction
+# runs once per distinct sentence and counts are scattered back with weights:
+#
+#   sentences = SentenceSet(lines, key=clean_sentence)
+#   results = extract_skill_keywords_batch(sentences.unique)
+#   counts = sentences.count(results)          # == counting over every line
+#   per_line = sentences.scatter(results)      # == extracting every line
+#
+# This is exact as long as the extractor's output only depends on the key
+# (clean_sentence for the keyword extractor, the raw text for the others).
+# Near-duplicates ("5+ years of Python" vs "5+ years of Python experience")
+# are found with MinHash over character shingles and LSH banding; folding
+# them together is approximate and therefore opt-in (merge_near_duplicates).
+
+MERSENNE = (1 << 61) - 1
+
+
+class SentenceSet:
+    def __init__(self, sentences, key=None):
+        """
+        sentences: iterable of str. key: normalizer deciding which sentences are the same
+        (default: exact text). unique[i] is the first sentence seen with the i-th key.
+        """
+        self.key = key
+        self.unique = []
+        self.counts = []
+        self.inverse = []
+        index = {}
+        for sentence in sentences:
+            k = key(sentence) if key else sentence
+            i = index.get(k)
+            if i is None:
+                i = index[k] = len(self.unique)
+                self.unique.append(sentence)
+                self.counts.append(0)
+            self.counts[i] += 1
+            self.inverse.append(i)
+
+    def __len__(self):
+        return len(self.unique)
+
+    @property
+    def total(self):
+        return len(self.inverse)
+
+    def scatter(self, results):
+        """Per-unique results -> per-input results, in input order (duplicates share objects)."""
+        return [results[i] for i in self.inverse]
+
+    def count(self, results, items=None, counter=None):
+        """
+        Counter over every input sentence, built from per-unique results: each item of
+        items(result) (default: the result itself, e.g. a list of skills) is weighted by the
+        multiplicity of its sentence.
+        """
+        counter = Counter() if counter is None else counter
+        for result, weight in zip(results, self.counts):
+            for item in (items(result) if items else result):
+                counter[item] += weight
+        return counter
+
+    def summary(self):
+        return f"{self.total} sentences, {len(self)} distinct ({1 - len(self) / max(self.total, 1):.0%} duplicates)"
+
+    # -- near-duplicates -----------------------------------------------------
+
+    def near_duplicate_clusters(self, threshold=0.8, num_perm=64, bands=16, shingle=5):
+        """
+        Groups of unique indices whose character-shingle Jaccard similarity is >= threshold.
+        Candidates come from MinHash LSH (num_perm hashes in `bands` bands) and are verified
+        on the exact shingle sets, so there are no false positives. Singletons are left out.
+        """
+        shingles = [_shingles(sentence, shingle) for sentence in self.unique]
+        signatures = minhash_signatures(shingles, num_perm)
+        rows = num_perm // bands
+
+        parent = list(range(len(self.unique)))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(bands):
+            buckets = {}
+            for i, band_signature in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+                buckets.setdefault(band_signature.tobytes(), []).append(i)
+            for members in buckets.values():
+                first = members[0]
+                for other in members[1:]:
+                    a, b = find(first), find(other)
+                    if a != b and jaccard(shingles[first], shingles[other]) >= threshold:
+                        parent[b] = a
+
+        clusters = {}
+        for i in range(len(self.unique)):
+            clusters.setdefault(find(i), []).append(i)
+        return [members for members in clusters.values() if len(members) > 1]
+
+    def merge_near_duplicates(self, **kwargs):
+        """
+        New SentenceSet where each near-duplicate cluster is represented by its most frequent
+        member. Counts then differ from a full run wherever cluster members would have
+        produced different results, so use it for exploration, not for reported numbers.
+        """
+        representative = list(range(len(self.unique)))
+        for members in self.near_duplicate_clusters(**kwargs):
+            best = max(members, key=lambda i: self.counts[i])
+            for i in members:
+                representative[i] = best
+
+        merged = SentenceSet([], key=self.key)
+        index = {}
+        for i in self.inverse:
+            r = representative[i]
+            if r not in index:
+                index[r] = len(merged.unique)
+                merged.unique.append(self.unique[r])
+                merged.counts.append(0)
+            merged.counts[index[r]] += 1
+            merged.inverse.append(index[r])
+        return merged
+
+
+def _shingles(sentence, size=5):
+    text = re.sub(r"\s+", " ", sentence.lower()).strip()
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def minhash_signatures(shingle_sets, num_perm=64, seed=1):
+    """(n, num_perm) uint64 MinHash signatures, h(x) = (a*x + b) mod (2^61 - 1) over crc32 shingle hashes."""
+    import numpy as np  # imported here: exact deduplication (baseline, hf) doesn't need it
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 29, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 29, size=num_perm, dtype=np.uint64)
+    mersenne = np.uint64(MERSENNE)
+    signatures = np.full((len(shingle_sets), num_perm), mersenne, dtype=np.uint64)
+    for i, shingles in enumerate(shingle_sets):
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # a < 2^29 and hashes < 2^32, so the products fit in uint64
+        signatures[i] = ((np.outer(hashes, a) + b) % mersenne).min(axis=0)
+    return signatures
+
+
+if __name__ == '__main__':
+    import argparse
+    from baseline import clean_sentence, get_requirement
+    from description import load_classified
+
+    parser = argparse.ArgumentParser(description='Report exact and near-duplicate requirement sentences')
+    parser.add_argument('--input', type=str, default='job_data_0414_classify.jsonl')
+    parser.add_argument('--threshold', type=float, default=0.8, help='shingle Jaccard for near-duplicates')
+    parser.add_argument('--show', type=int, default=5, help='print the largest N near-duplicate clusters')
+    args = parser.parse_args()
+
+    lines = get_requirement(load_classified(args.input))
+    exact = SentenceSet(lines)
+    print(f"Exact: {exact.summary()}")
+    cleaned = SentenceSet(lines, key=clean_sentence)
+    print(f"clean_sentence: {cleaned.summary()}")
+    clusters = cleaned.near_duplicate_clusters(threshold=args.threshold)
+    merged = cleaned.merge_near_duplicates(threshold=args.threshold)
+    print(f"Near-duplicates (>= {args.threshold}): {len(clusters)} clusters, {merged.summary()}")
+    for members in sorted(clusters, key=lambda m: -sum(cleaned.counts[i] for i in m))[:args.show]:
+        print(f"-- {sum(cleaned.counts[i] for i in members)} lines")
+        for i in members[:3]:
+            print(f"   {cleaned.counts[i]:>4}  {cleaned.unique[i][:100]}")
@@ -1,52 +1,228 @@
-import pandas as pd
 import json
+import os
+from itertools import islice
+from multiprocessing import Pool
 
-from bs4 import BeautifulSoup
-from collections import defaultdict
+from collections import defaultdict, deque, namedtuple
+from functools import lru_cache
+from html.parser import HTMLParser
 
 import re
+
+from section_cache import SectionCache, content_key
+
+# Bump whenever the section classifier changes output, so cached sections are not reused
+CLASSIFIER_VERSION = "4"
+
+# Header rules, in priority order: the first section with a matching phrase wins.
+# Phrases are substrings of the normalized header (lowercase, punctuation removed).
+SECTION_RULES = [
+    ("Responsibilities", [
+        "responsibilit",  # Catches "responsibilities", "responsibility"
+        "what will you",
+        "in this role",
+    ]),
+    ("Requirements", [
+        "requirement",
+        "qualificat",  # Catches "qualification", "qualifications", "qualification:"
+        "what you need",
+        "skill",
+        "minimum qualificat",
+        "preferred qualificat",
+        "experience",
+        "certification",
+    ]),
+    ("Job Description", ["job description", "your role", "what you can expect", "what the role is", "overview"]),
+    ("Preferred / Nice to Have", ["bonuses", "good to have"]),
+    ("Company Info", ["about the job", "why join", "who are we", "company"]),
+]
+
+def compile_section_rules(rules):
+    """[(section, regex)] with one alternation per rule, tried in priority order."""
+    return [(section, re.compile("|".join(re.escape(p) for p in phrases))) for section, phrases in rules]
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_SECTION_PATTERNS = compile_section_rules(SECTION_RULES)
+
 # extract sections from job description
+@lru_cache(maxsize=65536)  # headers repeat heavily across postings
 def normalize_section_name(raw_header: str) -> str:
     # Normalize: lowercase + remove punctuation
-    text = re.sub(r'[^\w\s]', '', raw_header.strip().lower())
-
-    # Check Responsibilities
-    if any(
-        x in text for x in [
-            "responsibilit",  # Catches "responsibilities", "responsibility"
-            "what will you", 
-            "in this role" 
-        ]
-    ):
-        return "Responsibilities"
-
-    # Check Requirements
-    if any(
-        x in text for x in [
-            "requirement", 
-            "qualificat",  # Catches "qualification", "qualifications", "qualification:"
-            "what you need", 
-            "skill",
-            "minimum qualificat",
-            "preferred qualificat",
-            "experience",
-            "certification"
-        ]
-    ):
-        return "Requirements"
-
-    # Other checks remain the same...
-    if any(x in text for x in ["job description", "your role", "what you can expect", "what the role is", "overview"]):
-        return "Job Description"
-    if any(x in text for x in ["bonuses", "good to have"]):
-        return "Preferred / Nice to Have"
-    if any(x in text for x in ["about the job", "why join", "who are we","company"]):
-        return "Company Info"
-
+    text = _PUNCTUATION.sub('', raw_header.strip().lower())
+    for section, pattern in _SECTION_PATTERNS:
+        if pattern.search(text):
+            return section
     return "Other"
 
-def extract_sections_from_html(description_html: str):
-    soup = BeautifulSoup(description_html, 'html.parser')
+# Section line with character offsets [start, end) into the cleaned text,
+# i.e. all section lines of the description joined with "\n".
+SectionSpan = namedtuple("SectionSpan", ["section", "text", "start", "end"])
+
+HEADER_TAGS = {"strong", "b", "h2", "h3", "h4"}
+CONTAINER_TAGS = {"p", "div", "span"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+class SectionStreamParser(HTMLParser):
+    """
+    Single linear pass over the description HTML (SAX-style, no tree, no mutation).
+    Follows the same rules as the tree walker:
+      - <strong>/<b>/<h2-4> directly under the top level or a p/div/span container is a header
+        (its text without <span> content, if shorter than 60 chars) and switches the section
+      - text directly inside p/div/span containers is a section line
+      - every <li> under a <ul> is one line, without <span> content
+      - anything else is skipped along with its subtree
+    Finished lines are queued in `ready`; pull them with drain() while feeding chunks.
+    Text is buffered until the next tag, comment or close(): HTMLParser hands a text node
+    over in pieces when it crosses a feed() boundary.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # (tag, mode), mode: container / header / header_span / list / ignored
+        self.current_section = "Other"
+        self.original_section_name = ""
+        self.header_parts = []
+        self.open_items = []  # [slot, span depth at <li>, text parts] per open <li>
+        self.span_depth = 0  # <span> nesting inside the current <ul>
+        self.lines = deque()  # [section, text or None while its <li> is open]
+        self.text_offset = 0
+        self.pending_text = []  # handle_data pieces of the current text node
+
+    def close(self):
+        super().close()
+        self._flush_text()
+
+    def _mode(self):
+        return self.stack[-1][1] if self.stack else "root"
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in VOID_TAGS:
+            return
+        parent = self._mode()
+        if parent in ("root", "container"):
+            if tag in HEADER_TAGS:
+                mode = "header"
+                self.header_parts = []
+            elif tag in CONTAINER_TAGS:
+                mode = "container"
+            elif tag == "ul":
+                mode = "list"
+                self.span_depth = 0
+            else:
+                mode = "ignored"
+        elif parent in ("header", "header_span"):
+            mode = "header_span" if tag == "span" or parent == "header_span" else "header"
+        elif parent == "list":
+            mode = "list"
+            if tag == "span":
+                self.span_depth += 1
+            elif tag == "li":
+                line = [self.current_section, None]
+                self.lines.append(line)
+                self.open_items.append([line, self.span_depth, []])
+        else:
+            mode = "ignored"
+        self.stack.append((tag, mode))
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in VOID_TAGS or all(t != tag for t, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, mode = self.stack.pop()
+            self._close(open_tag, mode)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag, mode):
+        if mode == "header" and (not self.stack or self.stack[-1][1] in ("root", "container")):
+            maybe_header = "".join(self.header_parts)
+            if maybe_header and len(maybe_header) < 60:
+                normalized = normalize_section_name(maybe_header)
+                if normalized == "Other":
+                    self.original_section_name = maybe_header
+                self.current_section = normalized
+        elif mode == "list":
+            if tag == "span":
+                self.span_depth -= 1
+            elif tag == "li" and self.open_items:
+                line, _, parts = self.open_items.pop()
+                line[1] = "".join(parts)
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_data(self, data):
+        self.pending_text.append(data)
+
+    def _flush_text(self):
+        if not self.pending_text:
+            return
+        data = "".join(self.pending_text)
+        self.pending_text = []
+        mode = self._mode()
+        if mode == "container":
+            text = data.strip()
+            if text:
+                if self.current_section == "Other":
+                    text = f"{self.original_section_name}: {text}"
+                self.lines.append([self.current_section, text])
+        elif mode == "header":
+            text = data.strip()
+            if text:
+                self.header_parts.append(text)
+        elif mode == "list":
+            text = data.strip()
+            if text:
+                for _, depth, parts in self.open_items:
+                    if depth == self.span_depth:
+                        parts.append(text)
+
+    def drain(self, final=False):
+        """Yield SectionSpans for every finished line, in document order."""
+        while self.lines and (self.lines[0][1] is not None or final):
+            section, text = self.lines.popleft()
+            text = (text or "").strip()
+            if not text:
+                continue
+            span = SectionSpan(section, text, self.text_offset, self.text_offset + len(text))
+            self.text_offset = span.end + 1  # "\n" separator
+            yield span
+
+def iter_section_spans(chunks):
+    """Stream SectionSpans from description HTML given as a string or an iterable of string chunks."""
+    if isinstance(chunks, str):
+        html = chunks
+        chunks = (html[i:i + 65536] for i in range(0, len(html), 65536))
+    parser = SectionStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.close()
+    yield from parser.drain(final=True)
+
+def extract_sections_with_offsets(description_html: str):
+    """Return (cleaned text, [SectionSpan]); span offsets index into the cleaned text."""
+    spans = list(iter_section_spans(description_html))
+    return "\n".join(span.text for span in spans), spans
+
+# "stream" is the single-pass parser above; the others are BeautifulSoup backends
+# (lxml and html5lib are optional installs, not project dependencies)
+PARSERS = ["stream", "html.parser", "lxml", "html5lib"]
+
+def extract_sections_from_html(description_html: str, parser: str = "stream"):
+    if parser != "stream":
+        return extract_sections_from_html_bs4(description_html, parser)
+    sections = {}
+    for span in iter_section_spans(description_html):
+        sections.setdefault(span.section, []).append(span.text)
+    return sections
+
+def extract_sections_from_html_bs4(description_html: str, parser: str = "html.parser"):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(description_html, parser)
     sections = defaultdict(list)
     current_section = "Other"  # Default section
     original_section_name = ""
@@ -91,29 +267,142 @@ def extract_sections_from_html(description_html: str):
                 if li_text:
                     sections[current_section].append(li_text)
 
-    for tag in soup.find_all(recursive=False):
+    # lxml and html5lib wrap the fragment in <html><body>; html.parser does not
+    for tag in (soup.body or soup).find_all(recursive=False):
         process_tag(tag)
 
     # Join consecutive text snippets in each section
     return {k: [line.strip() for line in v if line.strip()] for k, v in sections.items()}
 
-input_file="job_data_0414.json"
-output_file="job_data_0414_classify.json"
 
-with open(input_file, "r", encoding="utf-8") as f:
-    data = json.load(f)
+def spans_from_sections(sections):
+    """(cleaned text, [SectionSpan]) for a {section: [lines]} dict, lines in section order."""
+    spans, offset = [], 0
+    for section, lines in sections.items():
+        for line in lines:
+            spans.append(SectionSpan(section, line, offset, offset + len(line)))
+            offset += len(line) + 1  # "\n" separator
+    return "\n".join(span.text for span in spans), spans
+
+def classify_job(item):
+    """
+    (job_id, description_html, parser) -> {"job_id", <section>: [lines], "text", "spans"};
+    picklable for the pool. text is the cleaned description and spans are
+    [section, start, end] offsets into it.
+    """
+    job_id, description_html, parser = item
+    if parser == "stream":
+        text, spans = extract_sections_with_offsets(description_html)
+    else:
+        text, spans = spans_from_sections(extract_sections_from_html(description_html, parser=parser))
+    record = {"job_id": job_id}
+    for span in spans:
+        record.setdefault(span.section, []).append(span.text)
+    record["text"] = text
+    record["spans"] = [[span.section, span.start, span.end] for span in spans]
+    return record
+
+def record_spans(record):
+    """SectionSpans of a classified record (empty for files written before spans were stored)."""
+    text = record.get("text", "")
+    return [SectionSpan(section, text[start:end], start, end) for section, start, end in record.get("spans", [])]
+
+def iter_descriptions(input_file):
+    """Lazily yield (job_id, description_html) from a job store (.db), JSONL or job_data JSON file."""
+    if input_file.endswith(".jsonl"):
+        with open(input_file, "r", encoding="utf-8") as f:
+            for line in f:
+                job = json.loads(line)
+                if job.get("Description"):
+                    yield job["job_id"], job["Description"]
+        return
+    from job_store import iter_job_file
+    for job in iter_job_file(input_file):
+        if job.get("Description"):
+            yield job["job_id"], job["Description"]
+
+def classify_file(input_file, output_file, workers=None, parser="stream", batch_size=256, cache_path=None):
+    """
+    Classify every description of input_file and append one JSON line per job to output_file.
+    Work is fanned out over a process pool in bounded batches so memory stays flat.
+    With cache_path, descriptions already parsed by this classifier version are read from the
+    SectionCache and only new or changed HTML is parsed.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter_descriptions(input_file)
+    cache = SectionCache(cache_path) if cache_path else None
+    count = 0
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        with open(output_file, "w", encoding="utf-8") as out:
+            while True:
+                batch = list(islice(jobs, batch_size * workers))
+                if not batch:
+                    break
+
+                cached = {}
+                if cache:
+                    keys = [content_key(html, CLASSIFIER_VERSION, parser) for _, html in batch]
+                    cached = cache.get_many(keys)
+                    todo = [(job_id, html, parser) for (job_id, html), key in zip(batch, keys) if key not in cached]
+                    cache.hits += len(batch) - len(todo)
+                    cache.misses += len(todo)
+                else:
+                    todo = [(job_id, html, parser) for job_id, html in batch]
+
+                if pool:
+                    parsed = pool.imap(classify_job, todo, chunksize=max(1, batch_size // 4))
+                else:
+                    parsed = map(classify_job, todo)
+                parsed = {record["job_id"]: record for record in parsed}
+
+                new_entries = {}
+                for i, (job_id, html) in enumerate(batch):
+                    if cache and keys[i] in cached:
+                        record = {"job_id": job_id}
+                        record.update(cached[keys[i]])
+                    else:
+                        record = parsed[job_id]
+                        if cache:
+                            new_entries[keys[i]] = {k: v for k, v in record.items() if k != "job_id"}
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    count += 1
+                if new_entries:
+                    cache.put_many(new_entries)
+                print(f"{count} descriptions classified")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        if cache:
+            cache.print_stats()
+            cache.close()
+    print(f"Sections saved to {output_file}")
+    return count
+
+def load_classified(file_path):
+    """Yield classified jobs from a JSONL output or a legacy JSON list file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
 
-descriptions = [
-    job["Description"] 
-    for job in data.values() 
-    if "Description" in job and job["Description"]
-]
 
-all_results = []
-for desc in descriptions:
-    sections = extract_sections_from_html(desc)
-    all_results.append(sections)
+if __name__ == '__main__':
+    import argparse
 
-with open(output_file, "w", encoding='utf-8') as file:
-    json.dump(all_results, file, indent=4, ensure_ascii=False)  # Fix here # Single structured file
+    parser = argparse.ArgumentParser(description='Split job descriptions into sections')
+    parser.add_argument('--input', type=str, default='job_data_0414.json', help='job_data JSON, JSONL or jobs.db')
+    parser.add_argument('--output', type=str, default='job_data_0414_classify.jsonl', help='JSONL output, one job per line')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--parser', type=str, default='stream', choices=PARSERS,
+                        help='single-pass "stream" parser, or a BeautifulSoup backend (lxml/html5lib must be installed)')
+    parser.add_argument('--cache', type=str, default='section_cache.db',
+                        help='Section cache database ("" to disable)')
+    args = parser.parse_args()
 
+    classify_file(args.input, args.output, workers=args.workers, parser=args.parser,
+                  cache_path=args.cache or None)
@@ -1,5 +1,19 @@
 import json
-from collections import defaultdict
+import re
+
+import numpy as np
+from scipy import sparse
+
+# Skill extraction evaluation.
+#
+# Comparison files hold one entry per labelled sentence:
+#   {"sentence": ..., "ground_truth": [...], "rule_result": [...], "nlp_result": [...], ...}
+# Every "*_result" key is a method. Entries are streamed (JSONL, or a JSON list),
+# skills are normalized (strip + lower) and interned into integer ids, and each
+# method becomes a sparse boolean entry x skill matrix, so tp/fp/fn for all
+# entries, all methods and every skill are a handful of sparse products.
+
+DEFAULT_METHODS = ["nlp_result", "model_result", "rule_result"]
 
 def compute_metrics(preds, golds):
     # normalize to lowercase stripped tokens
@@ -13,53 +27,228 @@ def compute_metrics(preds, golds):
     f1 = (2 * precision * recall / (precision + recall)) if precision + recall > 0 else 0.0
     return precision, recall, f1, tp, fp, fn
 
+def _prf(tp, fp, fn):
+    """Vectorized precision/recall/F1 with the compute_metrics convention (0.0 on empty denominators)."""
+    tp, fp, fn = (np.asarray(x, dtype=float) for x in (tp, fp, fn))
+    precision = np.divide(tp, tp + fp, out=np.zeros_like(tp), where=tp + fp > 0)
+    recall = np.divide(tp, tp + fn, out=np.zeros_like(tp), where=tp + fn > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros_like(tp), where=precision + recall > 0)
+    return precision, recall, f1
 
-def evaluate_comparison(json_file):
-    cnt = 0
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # accumulate metrics
-    results = defaultdict(lambda: {'precision': [], 'recall': [], 'f1': [], 'tp': 0, 'fp': 0, 'fn': 0})
-
-    for entry in data:
-        gold = entry.get('ground_truth', [])
-        if len(gold)==0:
-            cnt+=1
-            continue
-        for key in ['nlp_result', 'model_result',"rule_result"]:
-            preds = entry.get(key, [])
-            precision, recall, f1, tp, fp, fn = compute_metrics(preds, gold)
-            results[key]['precision'].append(precision)
-            results[key]['recall'].append(recall)
-            results[key]['f1'].append(f1)
-            results[key]['tp'] += tp
-            results[key]['fp'] += fp
-            results[key]['fn'] += fn
-    print(cnt)
-    # print metrics per method
-    for method, metrics in results.items():
-        n = len(metrics['precision'])
-        avg_prec = sum(metrics['precision']) / n
-        avg_rec = sum(metrics['recall']) / n
-        avg_f1 = sum(metrics['f1']) / n
-        micro_prec = metrics['tp'] / (metrics['tp'] + metrics['fp']) if (metrics['tp'] + metrics['fp']) > 0 else 0.0
-        micro_rec = metrics['tp'] / (metrics['tp'] + metrics['fn']) if (metrics['tp'] + metrics['fn']) > 0 else 0.0
-        micro_f1 = (2 * micro_prec * micro_rec / (micro_prec + micro_rec)) if (micro_prec + micro_rec) > 0 else 0.0
+def iter_entries(path):
+    """Entries of a comparison file: JSONL is streamed line by line, .json is a list."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+def method_keys(entry):
+    return [key for key in entry if key.endswith("_result")]
+
+
+class SkillVocab:
+    """Interned, normalized skill strings."""
+
+    def __init__(self):
+        self.skills = []
+        self.index = {}
+        self._tokens = []
+
+    def __len__(self):
+        return len(self.skills)
+
+    def ids(self, values):
+        ids = set()
+        for value in values:
+            skill = value.strip().lower()
+            i = self.index.get(skill)
+            if i is None:
+                i = self.index[skill] = len(self.skills)
+                self.skills.append(skill)
+                self._tokens.append(frozenset(re.findall(r"[\w+#.]+", skill)))
+            ids.add(i)
+        return sorted(ids)
+
+    def similarity(self, a, b):
+        """Token Jaccard between two skill ids ("python" vs "python programming" -> 0.5)."""
+        ta, tb = self._tokens[a], self._tokens[b]
+        return len(ta & tb) / len(ta | tb) if ta or tb else 0.0
+
+
+class Evaluation:
+    def __init__(self, entries, methods=None, gold_key="ground_truth", skip_empty=True):
+        """
+        entries: iterable of comparison entries. methods: "*_result" keys to evaluate
+        (default: every one seen, DEFAULT_METHODS first). Entries without gold skills are
+        skipped, as evaluate_comparison always did, and counted in self.skipped.
+        """
+        self.vocab = SkillVocab()
+        self.skipped = 0
+        rows = {"gold": ([0], [])}
+        seen = list(methods or [])
+        n = 0
+        for entry in entries:
+            gold = entry.get(gold_key, [])
+            if skip_empty and len(gold) == 0:
+                self.skipped += 1
+                continue
+            if methods is None:
+                seen.extend(key for key in method_keys(entry) if key not in seen)
+            for name in ["gold"] + seen:
+                indptr, indices = rows.setdefault(name, ([0] * (n + 1), []))
+                indices.extend(self.vocab.ids(entry.get(gold_key if name == "gold" else name, [])))
+                indptr.append(len(indices))
+            n += 1
+
+        self.n = n
+        self.methods = seen if methods else sorted(
+            seen, key=lambda m: (m not in DEFAULT_METHODS, DEFAULT_METHODS.index(m) if m in DEFAULT_METHODS else 0))
+        shape = (n, len(self.vocab))
+        self.matrices = {
+            name: sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, indptr), shape=shape)
+            for name, (indptr, indices) in rows.items()
+        }
+        self.gold = self.matrices.pop("gold")
 
+    # -- exact matching ------------------------------------------------------
+
+    def entry_counts(self, method):
+        """Per-entry (tp, fp, fn) arrays."""
+        pred = self.matrices[method]
+        tp = np.asarray(pred.multiply(self.gold).sum(axis=1)).ravel()
+        fp = np.asarray(pred.sum(axis=1)).ravel() - tp
+        fn = np.asarray(self.gold.sum(axis=1)).ravel() - tp
+        return tp, fp, fn
+
+    def skill_counts(self, method):
+        """Per-skill (tp, fp, fn) arrays, indexed by vocab id."""
+        pred = self.matrices[method]
+        tp = np.asarray(pred.multiply(self.gold).sum(axis=0)).ravel()
+        fp = np.asarray(pred.sum(axis=0)).ravel() - tp
+        fn = np.asarray(self.gold.sum(axis=0)).ravel() - tp
+        return tp, fp, fn
+
+    # -- fuzzy matching ------------------------------------------------------
+
+    def fuzzy_entry_counts(self, method, threshold=0.5):
+        """
+        Per-entry (tp, fp, fn) where, after exact matches, a leftover prediction also counts
+        as a hit when its token Jaccard with a leftover gold skill is >= threshold
+        (greedy one-to-one, most similar pairs first).
+        """
+        tp, fp, fn = (x.copy() for x in self.entry_counts(method))
+        pred, gold = self.matrices[method], self.gold
+        for i in np.flatnonzero((fp > 0) & (fn > 0)):
+            p = set(pred.indices[pred.indptr[i]:pred.indptr[i + 1]])
+            g = set(gold.indices[gold.indptr[i]:gold.indptr[i + 1]])
+            p, g = p - g, g - p
+            pairs = sorted(((self.vocab.similarity(a, b), a, b) for a in p for b in g), reverse=True)
+            used_p, used_g = set(), set()
+            for score, a, b in pairs:
+                if score < threshold:
+                    break
+                if a in used_p or b in used_g:
+                    continue
+                used_p.add(a)
+                used_g.add(b)
+            tp[i] += len(used_p)
+            fp[i] -= len(used_p)
+            fn[i] -= len(used_p)
+        return tp, fp, fn
+
+    # -- reports -------------------------------------------------------------
+
+    def summary(self, method, fuzzy=None):
+        """Macro (mean over entries) and micro (pooled) precision/recall/F1 plus tp/fp/fn totals."""
+        tp, fp, fn = self.fuzzy_entry_counts(method, fuzzy) if fuzzy else self.entry_counts(method)
+        precision, recall, f1 = _prf(tp, fp, fn)
+        micro = _prf(tp.sum(), fp.sum(), fn.sum())
+        return {
+            "entries": self.n,
+            "macro_precision": float(precision.mean()) if self.n else 0.0,
+            "macro_recall": float(recall.mean()) if self.n else 0.0,
+            "macro_f1": float(f1.mean()) if self.n else 0.0,
+            "micro_precision": float(micro[0]),
+            "micro_recall": float(micro[1]),
+            "micro_f1": float(micro[2]),
+            "tp": int(tp.sum()), "fp": int(fp.sum()), "fn": int(fn.sum()),
+        }
+
+    def per_skill(self, method, top=None):
+        """Per-skill confusion rows, most errors (fp + fn) first."""
+        tp, fp, fn = self.skill_counts(method)
+        precision, recall, f1 = _prf(tp, fp, fn)
+        order = np.lexsort((-tp, -(fp + fn)))
+        order = order[(tp + fp + fn)[order] > 0][:top]
+        return [{"skill": self.vocab.skills[i], "tp": int(tp[i]), "fp": int(fp[i]), "fn": int(fn[i]),
+                 "precision": float(precision[i]), "recall": float(recall[i]), "f1": float(f1[i])}
+                for i in order]
+
+    def bootstrap(self, method, samples=1000, alpha=0.05, seed=0, fuzzy=None):
+        """
+        Percentile bootstrap CIs over entries for micro and macro F1: each resample is a
+        row of multinomial entry weights, so all resamples are one matrix product.
+        """
+        tp, fp, fn = self.fuzzy_entry_counts(method, fuzzy) if fuzzy else self.entry_counts(method)
+        rng = np.random.default_rng(seed)
+        weights = rng.multinomial(self.n, np.full(self.n, 1.0 / self.n), size=samples)
+        micro_f1 = _prf(weights @ tp, weights @ fp, weights @ fn)[2]
+        macro_f1 = weights @ _prf(tp, fp, fn)[2] / self.n
+        bounds = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+        return {
+            "micro_f1": [float(x) for x in np.percentile(micro_f1, bounds)],
+            "macro_f1": [float(x) for x in np.percentile(macro_f1, bounds)],
+        }
+
+
+def evaluate_comparison(json_file, methods=None):
+    evaluation = Evaluation(iter_entries(json_file), methods)
+    print(evaluation.skipped)
+    # print metrics per method
+    for method in evaluation.methods:
+        metrics = evaluation.summary(method)
         print(f"=== {method} ===")
-        print(f"Macro Precision: {avg_prec:.4f}")
-        print(f"Macro Recall:    {avg_rec:.4f}")
-        print(f"Macro F1:        {avg_f1:.4f}")
-        print(f"Micro Precision: {micro_prec:.4f}")
-        print(f"Micro Recall:    {micro_rec:.4f}")
-        print(f"Micro F1:        {micro_f1:.4f}\n")
+        print(f"Macro Precision: {metrics['macro_precision']:.4f}")
+        print(f"Macro Recall:    {metrics['macro_recall']:.4f}")
+        print(f"Macro F1:        {metrics['macro_f1']:.4f}")
+        print(f"Micro Precision: {metrics['micro_precision']:.4f}")
+        print(f"Micro Recall:    {metrics['micro_recall']:.4f}")
+        print(f"Micro F1:        {metrics['micro_f1']:.4f}\n")
+    return evaluation
 
 if __name__ == '__main__':
     import argparse
 
     parser = argparse.ArgumentParser(description='Evaluate skill extraction methods')
-    parser.add_argument('--input', type=str, default='compare_simple_vs_model.json', help='Path to comparison JSON file')
+    parser.add_argument('--input', type=str, default='compare_simple_vs_model.json', help='Path to comparison JSON/JSONL file')
+    parser.add_argument('--methods', nargs='*', default=None, help='"*_result" keys to evaluate (default: all)')
+    parser.add_argument('--per-skill', type=int, default=0, help='Print the N skills with the most errors per method')
+    parser.add_argument('--bootstrap', type=int, default=0, help='Bootstrap resamples for F1 confidence intervals')
+    parser.add_argument('--fuzzy', type=float, default=None, help='Token Jaccard threshold for fuzzy span matches')
+    parser.add_argument('--output', type=str, default=None, help='Optional JSON report file')
     args = parser.parse_args()
 
-    evaluate_comparison(args.input)
+    evaluation = evaluate_comparison(args.input, args.methods)
+
+    report = {}
+    for method in evaluation.methods:
+        report[method] = evaluation.summary(method)
+        if args.fuzzy:
+            report[method]["fuzzy"] = fuzzy = evaluation.summary(method, fuzzy=args.fuzzy)
+            print(f"{method} fuzzy (>= {args.fuzzy}): micro F1 {fuzzy['micro_f1']:.4f}, macro F1 {fuzzy['macro_f1']:.4f}")
+        if args.bootstrap and evaluation.n:
+            report[method]["ci95"] = ci = evaluation.bootstrap(method, args.bootstrap, fuzzy=args.fuzzy)
+            print(f"{method} 95% CI: micro F1 [{ci['micro_f1'][0]:.4f}, {ci['micro_f1'][1]:.4f}], "
+                  f"macro F1 [{ci['macro_f1'][0]:.4f}, {ci['macro_f1'][1]:.4f}]")
+        if args.per_skill:
+            report[method]["per_skill"] = rows = evaluation.per_skill(method, args.per_skill)
+            print(f"--- {method}: skills with the most errors ---")
+            for row in rows:
+                print(f"{row['skill']:<30} tp={row['tp']:<4} fp={row['fp']:<4} fn={row['fn']:<4} f1={row['f1']:.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
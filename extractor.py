@@ -0,0 +1,98 @@
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+# Declarative selector table for the job detail pane.
+# Each field lists candidate CSS selectors (first match wins) and what to read
+# from the node: "innerText", "innerHTML" or an attribute name.
+# Selector drift is fixed by editing this table or by dropping overrides into
+# SELECTORS_FILE, not by touching the scraping loop.
+DETAIL_SELECTORS = {
+    "title": {"selectors": ["h1.t-24.t-bold"], "read": "innerText"},
+    "link": {"selectors": ["div.job-details-jobs-unified-top-card__job-title a"], "read": "href"},
+    "company": {"selectors": [".job-details-jobs-unified-top-card__company-name"], "read": "innerText"},
+    "meta": {"selectors": [".job-details-jobs-unified-top-card__tertiary-description-container"], "read": "innerText"},
+    "description": {"selectors": [".jobs-description-content__text--stretch"], "read": "innerHTML"},
+}
+
+SELECTORS_FILE = "selectors.json"
+
+# Runs inside the page: one round-trip returns every field of the table
+EXTRACT_JS = """
+(table) => {
+    const out = {};
+    for (const [field, spec] of Object.entries(table)) {
+        out[field] = null;
+        for (const sel of spec.selectors) {
+            const el = document.querySelector(sel);
+            if (!el) continue;
+            if (spec.read === 'innerText') out[field] = el.innerText;
+            else if (spec.read === 'innerHTML') out[field] = el.innerHTML;
+            else out[field] = el.getAttribute(spec.read);
+            break;
+        }
+    }
+    return out;
+}
+"""
+
+def load_selector_table(path=SELECTORS_FILE):
+    """Return DETAIL_SELECTORS with per-field overrides from a JSON file, if present."""
+    table = {field: dict(spec) for field, spec in DETAIL_SELECTORS.items()}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for field, spec in json.load(f).items():
+                table.setdefault(field, {}).update(spec)
+    return table
+
+SELECTOR_TABLE = load_selector_table()
+
+
+def normalize_detail(raw):
+    """Turn raw extracted values into the fields main.py stores, with the usual fallbacks."""
+    job_title = (raw.get("title") or "").strip() or "N/A"
+    raw_link = raw.get("link")
+    clean_link = urlparse(raw_link).path if raw_link else "N/A"
+    job_id_match = re.search(r"/jobs/view/(\d+)", raw_link or "")
+    job_id = job_id_match.group(1) if job_id_match else clean_link  # fallback
+    company = (raw.get("company") or "").strip() or "N/A"
+    meta_text = raw.get("meta") or ""
+    description = (raw.get("description") or "").strip() or "No description found"
+    return {
+        "job_id": job_id,
+        "title": job_title,
+        "link": clean_link,
+        "company": company,
+        "meta": meta_text,
+        "description": description,
+    }
+
+def extract_detail(page, table=None):
+    """Read every detail field with a single page.evaluate (sync Playwright page)."""
+    return normalize_detail(page.evaluate(EXTRACT_JS, table or SELECTOR_TABLE))
+
+async def extract_detail_async(page, table=None):
+    """Same as extract_detail for an async Playwright page."""
+    return normalize_detail(await page.evaluate(EXTRACT_JS, table or SELECTOR_TABLE))
+
+def extract_detail_from_html(html, table=None):
+    """Parse a captured HTML snapshot locally with the same selector table."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    raw = {}
+    for field, spec in (table or SELECTOR_TABLE).items():
+        raw[field] = None
+        for sel in spec["selectors"]:
+            el = soup.select_one(sel)
+            if el is None:
+                continue
+            if spec["read"] == "innerText":
+                raw[field] = el.get_text("\n")
+            elif spec["read"] == "innerHTML":
+                raw[field] = el.decode_contents()
+            else:
+                raw[field] = el.get(spec["read"])
+            break
+    return normalize_detail(raw)
@@ -1,11 +1,16 @@
 import numpy as np
 import json
-from transformers import pipeline
+import time
 from collections import Counter
+from contextlib import nullcontext
 
-# Load models for skill and knowledge extraction
-token_skill_classifier = pipeline(model="jjzha/jobbert_skill_extraction", aggregation_strategy="first")
-token_knowledge_classifier = pipeline(model="jjzha/jobbert_knowledge_extraction", aggregation_strategy="first")
+from dedupe import SentenceSet
+from description import load_classified
+import models
+from inference_cache import cached_map, get_inference_cache
+from models import get_hf_pipeline, set_hf_backend, HF_BACKENDS, HF_MODELS
+
+# Models for skill and knowledge extraction are loaded on first use (models.py)
 
 # Example sentences
 examples = [
@@ -29,23 +34,19 @@ def aggregate_span(results):
     new_results.append(current_result)
     return new_results
 
-# Function to process text and extract skills and knowledge
-def ner(text, skill_counter, knowledge_counter):
-    # Get skill predictions
-    output_skills = token_skill_classifier(text)
+def _collect(text, output_skills, output_knowledge, skill_counter, knowledge_counter, weight=1):
+    # weight: how many times the text occurs in the corpus
     for result in output_skills:
         if result.get("entity_group"):
             result["entity"] = "Skill"
             del result["entity_group"]
-            skill_counter[result["word"]] += 1  # Count frequency of skills
+            skill_counter[result["word"]] += weight  # Count frequency of skills
 
-    # Get knowledge predictions
-    output_knowledge = token_knowledge_classifier(text)
     for result in output_knowledge:
         if result.get("entity_group"):
             result["entity"] = "Knowledge"
             del result["entity_group"]
-            knowledge_counter[result["word"]] += 1  # Count frequency of knowledge
+            knowledge_counter[result["word"]] += weight  # Count frequency of knowledge
 
     # Aggregate consecutive spans
     if len(output_skills) > 0:
@@ -54,8 +55,73 @@ def ner(text, skill_counter, knowledge_counter):
         output_knowledge = aggregate_span(output_knowledge)
 
     # Collect results
-    results = {"text": text, "skills": output_skills, "knowledge": output_knowledge}
-    return results
+    return {"text": text, "skills": output_skills, "knowledge": output_knowledge}
+
+def inference_mode():
+    try:
+        import torch
+        return torch.inference_mode()
+    except ImportError:
+        return nullcontext()
+
+class ThroughputReporter:
+    """Prints progress and sentences/sec at most every `every` seconds."""
+
+    def __init__(self, total, every=10.0):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.start = self.last = time.perf_counter()
+
+    def update(self, n):
+        self.done += n
+        now = time.perf_counter()
+        if now - self.last >= self.every or self.done >= self.total:
+            self.last = now
+            rate = self.done / (now - self.start) if now > self.start else 0.0
+            eta = (self.total - self.done) / rate if rate else 0.0
+            print(f"{self.done}/{self.total} sentences, {rate:.1f} sentences/s, ETA {eta:.0f}s")
+
+def ner_batch(texts, skill_counter, knowledge_counter, batch_size=32, chunk_size=512, reporter=None, backend=None):
+    """
+    Run both extractors over a list of sentences.
+    Repeated sentences are run once and counted with their multiplicity (dedupe.SentenceSet).
+    Sentences are sorted by length so each batch pads to similar lengths, passed to the
+    pipelines as lists with batch_size under torch.inference_mode, and returned in input order.
+    backend: "torch", "int8" or "onnx" (default: models.HF_BACKEND).
+    """
+    sentences = SentenceSet(texts)
+    texts, weights = sentences.unique, sentences.counts
+    print(sentences.summary())
+    reporter = reporter or ThroughputReporter(len(texts))
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    results = [None] * len(texts)
+    with inference_mode():
+        for start in range(0, len(order), chunk_size):
+            chunk = order[start:start + chunk_size]
+            outputs = _cached_outputs([texts[i] for i in chunk], batch_size, backend)
+            for i, (skills, knowledge) in zip(chunk, outputs):
+                results[i] = _collect(texts[i], skills, knowledge, skill_counter, knowledge_counter, weights[i])
+            reporter.update(len(chunk))
+    return sentences.scatter(results)
+
+def _cached_outputs(texts, batch_size=32, backend=None):
+    """Raw [skills, knowledge] pipeline outputs per text, memoized in the inference cache."""
+    backend = backend or models.HF_BACKEND
+
+    def compute(batch):
+        output_skills = get_hf_pipeline("skill", backend)(batch, batch_size=batch_size)
+        output_knowledge = get_hf_pipeline("knowledge", backend)(batch, batch_size=batch_size)
+        return [[skills, knowledge] for skills, knowledge in zip(output_skills, output_knowledge)]
+
+    # Keyed on the exact text: outputs carry character offsets into it
+    version = f"{HF_MODELS['skill']}+{HF_MODELS['knowledge']}:{backend}"
+    return cached_map("jobbert", version, texts, compute)
+
+# Function to process text and extract skills and knowledge
+def ner(text, skill_counter, knowledge_counter, backend=None):
+    output_skills, output_knowledge = _cached_outputs([text], backend=backend)[0]
+    return _collect(text, output_skills, output_knowledge, skill_counter, knowledge_counter)
 
 # Custom function to handle float32 serialization
 def custom_serializer(obj):
@@ -65,11 +131,19 @@ def custom_serializer(obj):
 
 # Main processing function
 if __name__ == '__main__':
-    input_file = "job_data_0414_classify.json"
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Extract skills and knowledge with JobBERT')
+    parser.add_argument('--backend', type=str, default=None, choices=HF_BACKENDS,
+                        help='Inference backend (default: HF_BACKEND env or torch)')
+    args = parser.parse_args()
+    if args.backend:
+        set_hf_backend(args.backend)
+
+    input_file = "job_data_0414_classify.jsonl"
     output_file = "extracted_skills_knowledge.json"
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        job_data = json.load(f)
+    job_data = load_classified(input_file)
 
     combined_lines = []
     for job in job_data:
@@ -82,13 +156,8 @@ if __name__ == '__main__':
     knowledge_counter = Counter()
 
     
-    # Process each example and collect results
-    all_results = []
-    for example in combined_lines:
-        result = ner(example, skill_counter, knowledge_counter)
-        all_results.append(result)
-        if (len(all_results) % 100 == 0):
-            print(len(all_results))
+    # Process all lines in length-sorted batches and collect results
+    all_results = ner_batch(combined_lines, skill_counter, knowledge_counter)
 
     # Save extracted results to a JSON file using custom serializer
     with open(output_file, "w", encoding="utf-8") as f:
@@ -104,6 +173,9 @@ if __name__ == '__main__':
     with open("frequency_counts.json", "w", encoding="utf-8") as f:
         json.dump(frequency_data, f, ensure_ascii=False, indent=4, default=custom_serializer)
 
+    if get_inference_cache():
+        get_inference_cache().print_stats()
+
     # Print the most common skills and knowledge for verification
     print("Most Common Skills:")
     print(skill_counter.most_common(10))  # Top 10 skills
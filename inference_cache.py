@@ -0,0 +1,173 @@
+import atexit
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+
+# Disk-backed memoization for sentence-level extractors.
+#
+# Requirement bullets repeat across postings, so extractor outputs are stored
+# under (extractor name, model version, normalized sentence). The model version
+# string changes whenever the model or rules change, which keeps stale results
+# from being served. Least recently used entries are evicted past max_entries.
+#
+# A lookup costs a SQLite round trip, so only extractors much slower than that
+# (spaCy, transformers) go through here; the rule matcher is not cached. LRU
+# touches and new rows are committed in batches of flush_every, and on close().
+#
+# INFERENCE_CACHE=<path> picks the database file, INFERENCE_CACHE="" disables it.
+
+CACHE_FILE = os.getenv("INFERENCE_CACHE", "inference_cache.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    extractor   TEXT NOT NULL,
+    version     TEXT NOT NULL,
+    sentence    TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (extractor, version, sentence)
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access);
+"""
+
+def _to_json(obj):
+    # numpy scalars (pipeline scores) -> plain Python numbers
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+class InferenceCache:
+    def __init__(self, path=CACHE_FILE, max_entries=1_000_000, flush_every=10_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self._touched = {}  # (extractor, version, sentence) -> last access, written on flush
+        self._pending = 0  # rows inserted since the last commit
+        self.hits = Counter()
+        self.misses = Counter()
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.size = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def flush(self):
+        """Write deferred LRU touches and commit pending rows."""
+        if self._touched:
+            self.conn.executemany(
+                "UPDATE results SET last_access = ? WHERE extractor = ? AND version = ? AND sentence = ?",
+                [(now, *key) for key, now in self._touched.items()])
+            self._touched = {}
+        self.conn.commit()
+        self._pending = 0
+
+    def _maybe_flush(self):
+        if len(self._touched) + self._pending >= self.flush_every:
+            self.flush()
+
+    def get_many(self, extractor, version, keys):
+        """{key: JSON text} for the cached keys; touches them for LRU (deferred to flush)."""
+        found = {}
+        unique = list(set(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT sentence, value FROM results WHERE extractor = ? AND version = ? "
+                f"AND sentence IN ({','.join('?' * len(chunk))})", [extractor, version] + chunk)
+            found.update(rows)
+        if found:
+            now = time.time()
+            for key in found:
+                self._touched[(extractor, version, key)] = now
+            self._maybe_flush()
+        return found
+
+    def put_many(self, extractor, version, items):
+        """Store {key: JSON text}; committed with the next flush."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results (extractor, version, sentence, value, last_access) VALUES (?, ?, ?, ?, ?)",
+            [(extractor, version, key, value, now) for key, value in items.items()])
+        self._pending += len(items)
+        self.size += len(items)
+        if self.size > self.max_entries:
+            self.evict(int(self.max_entries * 0.9))
+        self._maybe_flush()
+
+    def evict(self, target_entries):
+        self.flush()  # LRU order needs the deferred touches
+        self.size = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = self.size - target_entries
+        if excess <= 0:
+            return
+        self.conn.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY last_access LIMIT ?)", (excess,))
+        self.conn.commit()
+        self.size -= excess
+        print(f"🧹 Evicted {excess} cached inference results")
+
+    def map(self, extractor, version, sentences, compute_batch, normalize=None):
+        """
+        Results for every sentence, in order. Cached ones are read from disk; the rest go
+        through compute_batch(list of sentences) -> list of JSON-serializable results, once
+        per distinct key, and are stored.
+        """
+        normalize = normalize or (lambda s: s)
+        keys = [normalize(sentence) for sentence in sentences]
+        cached = self.get_many(extractor, version, keys)
+
+        todo = {}  # key -> first sentence with that key
+        for key, sentence in zip(keys, sentences):
+            if key not in cached and key not in todo:
+                todo[key] = sentence
+        self.hits[extractor] += len(sentences) - len(todo)
+        self.misses[extractor] += len(todo)
+
+        if todo:
+            results = compute_batch(list(todo.values()))
+            computed = {key: json.dumps(value, ensure_ascii=False, default=_to_json)
+                        for key, value in zip(todo, results)}
+            self.put_many(extractor, version, computed)
+            cached.update(computed)
+        # Decode per occurrence: callers may mutate results, and hits and misses get identical types
+        return [json.loads(cached[key]) for key in keys]
+
+    def stats(self):
+        report = {}
+        for extractor in set(self.hits) | set(self.misses):
+            total = self.hits[extractor] + self.misses[extractor]
+            report[extractor] = {
+                "hits": self.hits[extractor],
+                "misses": self.misses[extractor],
+                "hit_rate": self.hits[extractor] / total if total else 0.0,
+            }
+        return report
+
+    def print_stats(self):
+        for extractor, row in self.stats().items():
+            print(f"Inference cache [{extractor}]: {row['hits']} hits, {row['misses']} misses "
+                  f"({row['hit_rate']:.0%} hit rate)")
+
+
+_cache = None
+
+def get_inference_cache():
+    """Process-wide cache, opened on first use (flushed at exit); None when INFERENCE_CACHE is set to ""."""
+    global _cache
+    if _cache is None and CACHE_FILE:
+        _cache = InferenceCache(CACHE_FILE)
+        atexit.register(_cache.close)
+    return _cache
+
+def cached_map(extractor, version, sentences, compute_batch, normalize=None):
+    """InferenceCache.map on the process-wide cache, or a plain compute_batch when caching is off."""
+    cache = get_inference_cache()
+    if cache is None:
+        return compute_batch(list(sentences))
+    return cache.map(extractor, version, list(sentences), compute_batch, normalize)
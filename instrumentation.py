@@ -0,0 +1,90 @@
+import csv
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# Scraper instrumentation: per-phase timing spans (navigation, scroll, click,
+# detail_wait, extraction, pagination), run counters (jobs, duplicates,
+# retries, errors) and a JSON / CSV run report.
+
+class Instrumentation:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started_at = time.perf_counter()
+        self.started_iso = datetime.now().isoformat()
+        self.durations = defaultdict(list)
+        self.counters = Counter()
+
+    @contextmanager
+    def span(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[phase].append(time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started_at
+        phases = {}
+        for phase, values in self.durations.items():
+            ordered = sorted(values)
+            phases[phase] = {
+                "count": len(values),
+                "total_s": round(sum(values), 3),
+                "mean_s": round(sum(values) / len(values), 3),
+                "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                "share": round(sum(values) / elapsed, 3) if elapsed else 0.0,
+            }
+        return {
+            "started_at": self.started_iso,
+            "elapsed_s": round(elapsed, 3),
+            "jobs_per_minute": round(self.counters["jobs"] / elapsed * 60, 2) if elapsed else 0.0,
+            "counters": dict(self.counters),
+            "phases": phases,
+        }
+
+    def write_report(self, path):
+        """Write the run report as JSON, or as one row per phase if path ends with .csv."""
+        report = self.report()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "count", "total_s", "mean_s", "p95_s", "share"])
+                for phase, row in report["phases"].items():
+                    writer.writerow([phase, row["count"], row["total_s"], row["mean_s"], row["p95_s"], row["share"]])
+                for name, value in report["counters"].items():
+                    writer.writerow([f"counter:{name}", value, "", "", "", ""])
+                writer.writerow(["jobs_per_minute", report["jobs_per_minute"], "", "", "", ""])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4)
+        print(f"Run report saved to {path}")
+        return report
+
+    def print_report(self):
+        report = self.report()
+        print(f"📈 {report['elapsed_s']}s, {report['jobs_per_minute']} jobs/min, counters: {report['counters']}")
+        for phase, row in sorted(report["phases"].items(), key=lambda x: -x[1]["total_s"]):
+            print(f"   {phase}: {row['total_s']}s total ({row['share']:.0%}), n={row['count']}, "
+                  f"mean={row['mean_s']}s p95={row['p95_s']}s")
+
+INSTRUMENTATION = Instrumentation()
+span = INSTRUMENTATION.span
+count = INSTRUMENTATION.count
+
+
+def error_screenshot(page, name, enabled):
+    """Debug screenshots are expensive: only taken on errors, and only when enabled."""
+    if not enabled:
+        return
+    try:
+        page.screenshot(path=f"error_{str(name).replace(' ', '_')}.png")
+    except Exception as e:
+        print(f"⚠️ Could not take screenshot: {e}")
@@ -0,0 +1,204 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+# SQLite-backed job store. Replaces rewriting the whole job_dict JSON after
+# every run: each scraped job is one upsert, lookups by job_id / company /
+# post date go through indexes, and iteration streams rows instead of loading
+# the whole corpus into memory.
+#
+# Jobs come back in the same shape as job_dict values:
+#   {"job_id", "Title", "Link", "Company", "Post Date", "Description", "snapshots": [...]}
+
+DB_FILE = "jobs.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    title       TEXT,
+    link        TEXT,
+    company     TEXT,
+    post_date   TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id      TEXT NOT NULL REFERENCES jobs(job_id),
+    scraped_at  TEXT,
+    applicants  TEXT,
+    keyword     TEXT,
+    UNIQUE (job_id, scraped_at, keyword)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS idx_jobs_post_date ON jobs(post_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_job_id ON snapshots(job_id);
+"""
+
+class JobStore:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, job_id):
+        return self.conn.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    # -- writes --------------------------------------------------------------
+
+    def _insert(self, job, commit=True):
+        self.conn.execute(
+            "INSERT INTO jobs (job_id, title, link, company, post_date, description) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO NOTHING",
+            (job["job_id"], job.get("Title"), job.get("Link"), job.get("Company"),
+             job.get("Post Date"), job.get("Description")),
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO snapshots (job_id, scraped_at, applicants, keyword) VALUES (?, ?, ?, ?)",
+            [(job["job_id"], s.get("scraped_at"), s.get("applicants"), s.get("keyword"))
+             for s in job.get("snapshots", [])],
+        )
+        if commit:
+            self.conn.commit()
+
+    def record_job(self, job_id, job_title, clean_link, company, exact_date, description, applicants, query):
+        """Same semantics as main.record_job: insert the job, or only add a snapshot if it exists."""
+        self._insert({
+            "job_id": job_id,
+            "Title": job_title,
+            "Link": clean_link,
+            "Company": company,
+            "Post Date": exact_date,
+            "Description": description,
+            "snapshots": [{
+                "scraped_at": datetime.now().isoformat(),
+                "applicants": applicants,
+                "keyword": query,
+            }],
+        })
+
+    def import_json(self, file_path, batch_size=1000):
+        """Import an existing job_data_*.json file (job_id -> job). Returns the number of jobs read."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            job_dict = json.load(f)
+        count = 0
+        for job_id, job in job_dict.items():
+            job.setdefault("job_id", job_id)
+            self._insert(job, commit=False)
+            count += 1
+            if count % batch_size == 0:
+                self.conn.commit()
+        self.conn.commit()
+        print(f"Imported {count} jobs from {file_path}")
+        return count
+
+    # -- reads ---------------------------------------------------------------
+
+    def _snapshots(self, job_id):
+        rows = self.conn.execute(
+            "SELECT scraped_at, applicants, keyword FROM snapshots WHERE job_id = ? ORDER BY id", (job_id,))
+        return [{"scraped_at": r[0], "applicants": r[1], "keyword": r[2]} for r in rows]
+
+    def _to_job(self, row, with_snapshots=True):
+        job = {
+            "job_id": row[0],
+            "Title": row[1],
+            "Link": row[2],
+            "Company": row[3],
+            "Post Date": row[4],
+            "Description": row[5],
+        }
+        if with_snapshots:
+            job["snapshots"] = self._snapshots(row[0])
+        return job
+
+    def get(self, job_id, default=None):
+        row = self.conn.execute(
+            "SELECT job_id, title, link, company, post_date, description FROM jobs WHERE job_id = ?",
+            (job_id,)).fetchone()
+        return self._to_job(row) if row else default
+
+    def iter_jobs(self, company=None, since=None, until=None, with_snapshots=True):
+        """Stream jobs, optionally filtered by company and post date range (YYYY-MM-DD, inclusive)."""
+        query = "SELECT job_id, title, link, company, post_date, description FROM jobs WHERE 1=1"
+        params = []
+        if company is not None:
+            query += " AND company = ?"
+            params.append(company)
+        if since is not None:
+            query += " AND post_date >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND post_date <= ?"
+            params.append(until)
+        # A separate cursor so snapshot lookups don't reset the row iteration
+        cursor = self.conn.cursor()
+        for row in cursor.execute(query + " ORDER BY post_date", params):
+            yield self._to_job(row, with_snapshots)
+
+    def items(self):
+        for job in self.iter_jobs():
+            yield job["job_id"], job
+
+    def iter_keyword_jobs(self, keyword):
+        """Stream (job_id, post_date) for jobs with at least one snapshot from this search keyword."""
+        yield from self.conn.cursor().execute(
+            "SELECT j.job_id, j.post_date FROM jobs j WHERE EXISTS "
+            "(SELECT 1 FROM snapshots s WHERE s.job_id = j.job_id AND s.keyword = ?)", (keyword,))
+
+    def iter_snapshots(self):
+        """Stream (job_id, scraped_at, applicants, keyword) rows in insertion order."""
+        yield from self.conn.cursor().execute(
+            "SELECT job_id, scraped_at, applicants, keyword FROM snapshots ORDER BY id")
+
+    def export_json(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(dict(self.items()), f, indent=4, ensure_ascii=False)
+        print(f"Jobs exported to {file_path}")
+
+
+def iter_job_file(file_path):
+    """Yield jobs from either a JobStore database or a job_data_*.json file."""
+    if file_path.endswith(".db"):
+        with JobStore(file_path) as store:
+            yield from store.iter_jobs()
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            for job_id, job in json.load(f).items():
+                job.setdefault("job_id", job_id)
+                yield job
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Manage the SQLite job store')
+    parser.add_argument('command', choices=['import', 'export', 'stats'])
+    parser.add_argument('files', nargs='*', help='job_data_*.json files to import, or the export target')
+    parser.add_argument('--db', type=str, default=DB_FILE)
+    args = parser.parse_args()
+
+    with JobStore(args.db) as store:
+        if args.command == 'import':
+            for file_path in args.files:
+                if os.path.exists(file_path):
+                    store.import_json(file_path)
+                else:
+                    print(f"❌ {file_path} not found.")
+        elif args.command == 'export':
+            store.export_json(args.files[0] if args.files else "job_data_export.json")
+        print(f"{len(store)} jobs in {args.db}")
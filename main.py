@@ -1,12 +1,21 @@
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import json
 import os
 from dotenv import load_dotenv
 import pandas as pd
-from urllib.parse import urlparse
 import re
 from datetime import datetime, timedelta
 from collections import defaultdict
+from extractor import extract_detail
+from network_capture import JobResponseCollector, block_heavy_resources, is_job_posting_response
+from instrumentation import INSTRUMENTATION, span, count, error_screenshot
+from job_store import JobStore
+from resilience import RunStats, CircuitBreaker, SystemicFailure, run_with_retry
+from seen_index import SeenIndex, PAGE_SIZE
+from waits import (
+    WAIT_STATS, get_card_job_id, wait_for_detail_job, wait_for_description,
+    count_cards, wait_for_card_growth, get_selected_page, wait_for_page_change,
+)
 
 # Load environment variables
 load_dotenv()
@@ -15,6 +24,26 @@ PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 
 COOKIES_FILE = "cookies.json"
 
+# Shared launch options for the persistent Chromium context (sync and async scrapers)
+CONTEXT_OPTIONS = dict(
+    user_data_dir="./profile",
+    headless=True,
+    viewport={"width": 1280, "height": 800},
+    locale="en-US",
+    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    permissions=["geolocation"],
+    timezone_id="Asia/Singapore",
+    geolocation={"longitude": 103.8198, "latitude": 1.3521},
+    args=[
+        "--disable-blink-features=AutomationControlled",
+        "--disable-web-security",
+        "--disable-dev-shm-usage",
+        "--no-sandbox"
+    ]
+)
+
+SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords={query}&location={location}&f_E=1&sortBy=DD"
+
 # Function to load cookies from file
 def load_cookies(page):
     if os.path.exists(COOKIES_FILE):
@@ -41,8 +70,9 @@ def go_to_next_page(page):
     next_button = page.query_selector("li.artdeco-pagination__indicator--number.selected + li")
     print(f"next page is :{next_button.inner_text().strip()}")
     if next_button and next_button.is_visible():
+        current_page = get_selected_page(page)
         next_button.click()
-        page.wait_for_timeout(2000)  # Wait for the next page to load
+        wait_for_page_change(page, current_page)  # Wait for the next page to load
         page.mouse.wheel(0, 1000)
         print("click!")
         return True
@@ -59,10 +89,12 @@ def scroll_job_list(page,max_time=5):
             # Move the mouse to the center of the element
             mouse_x = box['x'] + box['width'] / 2
             mouse_y = box['y'] + box['height'] / 2
+            previous_count = count_cards(page)
             page.mouse.move(mouse_x, mouse_y)
             page.mouse.wheel(0, 800)  
-
-        page.wait_for_timeout(2000)
+            wait_for_card_growth(page, previous_count)
+        else:
+            page.wait_for_timeout(2000)
 
 
 def get_exact_post_date(number, unit):
@@ -86,132 +118,306 @@ def get_exact_post_date(number, unit):
     post_date = today - delta
     return post_date.strftime('%Y-%m-%d')    
 
+def parse_meta_text(meta_text):
+    """Parse the top-card meta line into (post date, raw applicants string)."""
+    date_match = re.search(r"(Reposted\s+)?(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", meta_text)
+    if date_match:
+        number = int(date_match.group(2))
+        unit = date_match.group(3)
+        exact_date = get_exact_post_date(number, unit)
+    else:
+        exact_date = "N/A"
+
+    # Extract raw applicants info like "55 applicants" or "Over 100 applicants"
+    applicants_match = re.search(r"(Over\s+)?\d+\s+applicants", meta_text)
+    applicants = applicants_match.group(0) if applicants_match else "N/A"
+    return exact_date, applicants
+
+def record_job(job_dict, job_id, job_title, clean_link, company, exact_date, description, applicants, query):
+    """Insert a scraped job into job_dict, or append a snapshot if it is already known."""
+    if isinstance(job_dict, JobStore):
+        return job_dict.record_job(job_id, job_title, clean_link, company, exact_date, description, applicants, query)
+    snapshot = {
+        "scraped_at": datetime.now().isoformat(),
+        "applicants": applicants,
+        "keyword":query
+    }
+    if job_id in job_dict:
+        # Job seen before → add new snapshot
+        job_dict[job_id]["snapshots"].append(snapshot)
+    else:
+        job_dict[job_id] = {
+            "job_id": job_id,
+            "Title": job_title,
+            "Link": clean_link,
+            "Company": company,
+            "Post Date": exact_date,
+            "Description": description,
+            "snapshots": [snapshot]
+        }
+    return job_dict[job_id]
+
+def click_and_capture(page, card, card_job_id, collector, timeout=5000):
+    """Click a card and return the job parsed from its API response, or None if it never arrived."""
+    if card_job_id and card_job_id in collector.jobs:
+        card.click()  # already prefetched
+        return collector.pop(card_job_id)
+    try:
+        with page.expect_response(lambda r: is_job_posting_response(r.url), timeout=timeout):
+            card.click()
+    except PlaywrightTimeoutError:
+        pass
+    return collector.pop(card_job_id) if card_job_id else None
+
 # Main function to login and scrape jobs
-def login_and_scrape_with_descriptions(job_dict={},query="data analyst", location="Singapore", max_jobs=25):
-    with sync_playwright() as p:
-        context = p.chromium.launch_persistent_context(
-            user_data_dir="./profile",
-            headless=True,
-            viewport={"width": 1280, "height": 800},
-            locale="en-US",
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            permissions=["geolocation"],
-            timezone_id="Asia/Singapore",
-            geolocation={"longitude": 103.8198, "latitude": 1.3521},
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-web-security",
-                "--disable-dev-shm-usage",
-                "--no-sandbox"
-            ]
-        )
-
-        page = context.pages[0] if context.pages else context.new_page()
-        load_cookies(page)
-
-        search_url = f"https://www.linkedin.com/jobs/search/?keywords={query}&location={location}&f_E=1&sortBy=DD"
-        print(f"🔍 Navigating to: {search_url}")
+# mode="dom" scrapes the rendered detail pane, mode="network" reads the job-posting
+# API responses (falling back to the DOM when a card's response was not seen).
+# record_har: optional path to record a HAR file for offline replay (network_capture.py).
+def open_context(p, mode="dom", record_har=None):
+    """Launch the persistent context once; returns (context, page, collector or None)."""
+    launch_options = dict(CONTEXT_OPTIONS)
+    if record_har:
+        launch_options["record_har_path"] = record_har
+    context = p.chromium.launch_persistent_context(**launch_options)
+
+    collector = None
+    if mode == "network":
+        block_heavy_resources(context)
+        collector = JobResponseCollector()
+
+    page = context.pages[0] if context.pages else context.new_page()
+    if collector:
+        collector.attach(page)
+    load_cookies(page)
+    return context, page, collector
+
+# Scrape one (query, location) search on an already open page.
+# index: optional SeenIndex for incremental crawls; the crawl resumes from its
+# checkpointed page and stops after stop_after_known consecutive already-known jobs.
+# With a plain dict job_dict the index must have a persist callback (see seen_index.py).
+# seen_job_ids: ids already scraped in this run (shared across queries by the scheduler).
+# throttle: optional callable invoked before every request-generating action (global pacing).
+# stats / breaker: RunStats and CircuitBreaker shared across queries; failing cards are
+# retried max_card_attempts times, then skipped. Systemic failures raise SystemicFailure.
+# screenshots: save a debug screenshot on errors (off by default, they are expensive).
+# Returns job_dict, or None when the session is not logged in.
+def scrape_query(page, job_dict, query, location, max_jobs=25, collector=None, index=None,
+                 stop_after_known=3, seen_job_ids=None, throttle=None,
+                 stats=None, breaker=None, max_card_attempts=3, screenshots=False):
+    throttle = throttle or (lambda: None)
+    stats = stats or RunStats()
+    breaker = breaker or CircuitBreaker()
+    seen_job_ids = set() if seen_job_ids is None else seen_job_ids
+    if index and not isinstance(job_dict, JobStore) and index.persist is None:
+        raise ValueError("a plain job_dict needs SeenIndex(persist=...) to be resumable")
+
+    search_url = SEARCH_URL.format(query=query, location=location)
+    page_number = index.resume_page(query, location) if index else 0
+    if page_number:
+        print(f"↩️ Resuming crawl at results page {page_number + 1}")
+        search_url += f"&start={page_number * PAGE_SIZE}"
+    print(f"🔍 Navigating to: {search_url}")
+    throttle()
+    with span("navigation"):
         page.goto(search_url, wait_until="networkidle")
 
-        if not login_check(page):
-            print("❌ Need login!")
-            return None
-        else:
-            print("login success! ")
-            
-        page.screenshot(path="screenshot.png")
+    if not login_check(page):
+        print("❌ Need login!")
+        error_screenshot(page, "login", screenshots)
+        return None
+    else:
+        print("login success! ")
+        
+    with span("navigation"):
         page.wait_for_selector('.job-card-container')
-        # page.mouse.wheel(0, 1000)
-
-        job_count = 0
-        results = []
-        seen_job_ids = set()
+    # page.mouse.wheel(0, 1000)
+
+    job_count = 0
+    run_seen_count = len(seen_job_ids)
+    consecutive_known = 0
+    reached_known = False
+
+    def index_status(job_id):
+        """'new', 'skip' or 'stop' for a job id according to the incremental index."""
+        nonlocal consecutive_known
+        if not index or not job_id:
+            return "new"
+        status = index.status(query, location, job_id)
+        if status == "known":
+            consecutive_known += 1
+            print(f"⚠️ Already known job: {job_id} ({consecutive_known}/{stop_after_known})")
+            return "stop" if consecutive_known >= stop_after_known else "skip"
+        consecutive_known = 0
+        return "skip" if status == "in_progress" else "new"
+    
+    def scrape_card(card, card_job_id):
+        """Scrape one card; returns 'done', 'skip', 'stop' (known postings reached) or 'abort'."""
+        nonlocal job_count
+        if card_job_id in seen_job_ids:
+            return "skip"  # already scraped in this run, possibly by another query
+        action = index_status(card_job_id)
+        if action != "new":
+            if action != "stop":
+                count("duplicates")
+            return action
+        throttle()
+        if collector:
+            with span("click"):
+                captured = click_and_capture(page, card, card_job_id, collector)
+            if captured:
+                seen_job_ids.add(card_job_id)
+                print(f"\n--- Job {job_count + 1} --- (network)")
+                print("Title:", captured["title"])
+                record_job(job_dict, card_job_id, captured["title"], captured["link"],
+                           captured["company"], captured["post_date"], captured["description"],
+                           captured["applicants"], query)
+                if index:
+                    index.add(query, location, card_job_id, captured["post_date"])
+                job_count += 1
+                count("jobs")
+                return "done"
+        else:
+            with span("click"):
+                card.click()
+        with span("detail_wait"):
+            wait_for_detail_job(page, card_job_id)
+            wait_for_description(page)
         
-        while job_count < max_jobs:
+        with span("extraction"):
+            detail = extract_detail(page)
+        job_title = detail["title"]
+        clean_link = detail["link"]
+        job_id = detail["job_id"]
+        # Skip if we've already seen this job in any previous run
+        if job_id in seen_job_ids:
+            count("duplicates")
+            print(f"⚠️ Already seen job, skipping: {job_title} (job_id: {job_id})")
+            if(not index and len(seen_job_ids) - run_seen_count > 30):
+                return "abort"
+            return "skip"
+        if not card_job_id:
+            action = index_status(job_id)
+            if action != "new":
+                if action != "stop":
+                    count("duplicates")
+                return action
+
+        # Add to seen list for this run
+        seen_job_ids.add(job_id)
+        print("id:", job_id)
+
+        company = detail["company"]
+        exact_date, applicants = parse_meta_text(detail["meta"])
+        print(exact_date)    
+        description = detail["description"]
+
+        print(f"\n--- Job {job_count + 1} ---")
+        print("Title:", job_title)
+        record_job(job_dict, job_id, job_title, clean_link, company,
+                   exact_date, description, applicants, query)
+        if index:
+            index.add(query, location, job_id, exact_date)
+        job_count += 1
+        count("jobs")
+        return "done"
+
+    def on_card_error(key, error):
+        count("errors")
+        error_screenshot(page, key, screenshots)
+
+    def requery_card(i, card_job_id):
+        """Fresh handle for a card whose element may have been detached by a re-render."""
+        if card_job_id:
+            card = page.query_selector(f'.job-card-container[data-job-id="{card_job_id}"]')
+            if card:
+                return card
+        cards = page.query_selector_all('.job-card-container')
+        if i >= len(cards):
+            raise RuntimeError(f"card {i} is gone from the list")
+        return cards[i]
+    
+    while job_count < max_jobs and not reached_known:
+        with span("scroll"):
             scroll_job_list(page)
-            job_cards = page.query_selector_all('.job-card-container')
-
-
-            for i, card in enumerate(job_cards):
-                if job_count >= max_jobs:
-                    break
-                try:
-                    card.click()
-                    page.wait_for_timeout(2000)
-                    
-                    job_title_elem = page.query_selector("h1.t-24.t-bold")
-                    job_title = job_title_elem.inner_text().strip() if job_title_elem else "N/A"
-
-                    link_elem = page.query_selector("div.job-details-jobs-unified-top-card__job-title a")
-                    raw_link = link_elem.get_attribute("href") if link_elem else None
-                    clean_link = urlparse(raw_link).path if raw_link else "N/A"
-                    job_id_match = re.search(r"/jobs/view/(\d+)", raw_link)
-                    job_id = job_id_match.group(1) if job_id_match else clean_link  # fallback
-                    # Skip if we've already seen this job in any previous run
-                    if job_id in seen_job_ids:
-                        page.screenshot(path=f"screenshot{job_id}.png")
-                        print(f"⚠️ Already seen job, skipping: {job_title} (job_id: {job_id})")
-                        if(len(seen_job_ids)>30):
-                            return job_dict
-                        continue
-
-                    # Add to seen list for this run
-                    seen_job_ids.add(job_id)
-                    print("id:", job_id)
-
-
-                    company_elem = page.query_selector(".job-details-jobs-unified-top-card__company-name")
-                    company = company_elem.inner_text().strip() if company_elem else "N/A"
-
-                    meta_elem = page.query_selector(".job-details-jobs-unified-top-card__tertiary-description-container")
-                    meta_text = meta_elem.inner_text() if meta_elem else ""
-                    date_match = re.search(r"(Reposted\s+)?(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", meta_text)
-                    if date_match:
-                        number = int(date_match.group(2))
-                        unit = date_match.group(3)
-                        exact_date = get_exact_post_date(number, unit)
-                    else:
-                        exact_date = "N/A"
-                    print(exact_date)    
-
-                    # Extract raw applicants info like "55 applicants" or "Over 100 applicants"
-                    applicants_match = re.search(r"(Over\s+)?\d+\s+applicants", meta_text)
-                    applicants = applicants_match.group(0) if applicants_match else "N/A"
-
-                    desc_elem = page.query_selector(".jobs-description-content__text--stretch")
-                    description = desc_elem.inner_html().strip() if desc_elem else "No description found"
-
-                    snapshot = {
-                        "scraped_at": datetime.now().isoformat(),
-                        "applicants": applicants,
-                        "keyword":query
-                    }
-                    print(f"\n--- Job {job_count + 1} ---")
-                    print("Title:", job_title)
-                    if job_id in job_dict:
-                        # Job seen before → add new snapshot
-                        job_dict[job_id]["snapshots"].append(snapshot)
-                    else:
-                        job_dict[job_id] = {
-                            "job_id": job_id,
-                            "Title": job_title,
-                            "Link": clean_link,
-                            "Company": company,
-                            "Post Date": exact_date,
-                            "Description": description,
-                            "snapshots": [snapshot]
-                        }
-                    job_count += 1
-
-                except Exception as e:
-                    print(f"⚠️ Error scraping job {job_count + 1}: {e}")
-                    context.close()
-                    return job_dict 
-
-            if job_count < max_jobs and not go_to_next_page(page):
-                print("⚠️ No more pages to scrape.")
+        job_cards = page.query_selector_all('.job-card-container')
+
+
+        for i, card in enumerate(job_cards):
+            if job_count >= max_jobs:
+                break
+            try:
+                card_job_id = get_card_job_id(card)
+            except Exception:
+                card_job_id = None  # handle already detached, resolved by index on retry
+
+            def attempt(n, card=card, i=i, card_job_id=card_job_id):
+                return scrape_card(card if n == 0 else requery_card(i, card_job_id), card_job_id)
+
+            try:
+                outcome = run_with_retry(attempt, page, card_job_id or f"card {i}", stats, breaker,
+                                         attempts=max_card_attempts,
+                                         on_error=on_card_error)
+            except SystemicFailure as e:
+                print(f"⛔ Aborting run: {e}")
+                error_screenshot(page, "systemic", screenshots)
+                if index:
+                    index.save(query, location)
+                raise
+            if outcome == "done":
+                stats.success()
+            elif outcome == "stop":
+                reached_known = True
                 break
+            elif outcome == "abort":
+                return job_dict
+
+        if reached_known:
+            print("⏹️ Reached already-known postings, stopping early.")
+            break
+        if job_count >= max_jobs:
+            break  # page only partly processed, a resumed crawl starts from it again
+        page_number += 1
+        if index:
+            index.checkpoint(query, location, page_number)
+        throttle()
+        with span("pagination"):
+            has_next = go_to_next_page(page)
+        if not has_next:
+            print("⚠️ No more pages to scrape.")
+            reached_known = True  # end of results counts as a finished crawl
+            break
+
+    if index and reached_known:
+        index.finish(query, location)
+    elif index:
+        index.save(query, location)
+    return job_dict
 
+# Main function to login and scrape jobs (one query, its own browser context)
+# report: optional path for the JSON/CSV run report (instrumentation.py).
+def login_and_scrape_with_descriptions(job_dict={},query="data analyst", location="Singapore", max_jobs=25,
+                                       mode="dom", record_har=None, index=None, stop_after_known=3,
+                                       screenshots=False, report=None):
+    stats = RunStats()
+    INSTRUMENTATION.reset()
+    with sync_playwright() as p:
+        context, page, collector = open_context(p, mode=mode, record_har=record_har)
+        try:
+            if scrape_query(page, job_dict, query, location, max_jobs, collector=collector,
+                            index=index, stop_after_known=stop_after_known, stats=stats,
+                            screenshots=screenshots) is None:
+                return None
+        except Exception as e:
+            print(f"⚠️ Scrape stopped: {e}")
+        finally:
+            context.close()
+
+    INSTRUMENTATION.count("retries", stats.counts["retry"])
+    stats.print_report()
+    WAIT_STATS.print_report()
+    INSTRUMENTATION.print_report()
+    if report:
+        INSTRUMENTATION.write_report(report)
     return job_dict
 
 
@@ -235,9 +441,16 @@ def save_job_data(file_path, job_dict):
 
 if __name__ == '__main__':
     INPUT_FILE = "job_data_0414.json"
-    OUTPUT_FILE = "job_data_0421.json"
-
-    job_dict,seen_job_ids = load_job_data(INPUT_FILE)
-    login_and_scrape_with_descriptions(job_dict,query="Data Science", location="Singapore", max_jobs=200)
-    save_job_data(OUTPUT_FILE, job_dict)
-
+    DB_FILE = "jobs.db"
+
+    # Jobs are upserted into the SQLite store as they are scraped;
+    # the old JSON file is imported once on first run.
+    store = JobStore(DB_FILE)
+    if len(store) == 0 and os.path.exists(INPUT_FILE):
+        store.import_json(INPUT_FILE)
+    index = SeenIndex()
+    index.seed("Data Science", "Singapore", store)
+    login_and_scrape_with_descriptions(store,query="Data Science", location="Singapore", max_jobs=200,
+                                       index=index, report="run_report.json")
+    print(f"{len(store)} jobs in {DB_FILE}")
+    store.close()
@@ -0,0 +1,108 @@
+import os
+import threading
+
+# Process-wide, lazily initialized model registry.
+#
+# Nothing heavy (spaCy, transformers, nltk corpora) is imported until a model
+# is first asked for, so data-prep CLIs that never touch a model start fast.
+# Each spaCy task names the smallest model that serves it and the pipeline
+# components it can exclude; override a task's model with SPACY_MODEL_<TASK>,
+# e.g. SPACY_MODEL_KEYWORDS=en_core_web_sm.
+
+SPACY_TASKS = {
+    # noun chunks + POS + lemmas: parser, tagger, attribute_ruler, lemmatizer
+    "keywords": {"model": "en_core_web_lg", "exclude": ["ner"]},
+}
+
+HF_MODELS = {
+    "skill": "jjzha/jobbert_skill_extraction",
+    "knowledge": "jjzha/jobbert_knowledge_extraction",
+}
+
+HF_BACKENDS = ["torch", "int8", "onnx"]
+HF_BACKEND = os.getenv("HF_BACKEND", "torch")
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "model_cache")
+
+_models = {}
+_lock = threading.Lock()
+
+def _get_or_load(key, loader):
+    if key not in _models:
+        with _lock:
+            if key not in _models:
+                _models[key] = loader()
+    return _models[key]
+
+def spacy_model_name(task):
+    return os.getenv(f"SPACY_MODEL_{task.upper()}", SPACY_TASKS[task]["model"])
+
+def get_spacy(task="keywords"):
+    """spaCy pipeline for a task, loaded once per process with only the components it needs."""
+    def load():
+        import spacy
+
+        name = spacy_model_name(task)
+        print(f"Loading spaCy model {name} for {task}")
+        if name.startswith("blank:"):
+            return spacy.blank(name.split(":", 1)[1])
+        return spacy.load(name, exclude=SPACY_TASKS[task]["exclude"])
+    return _get_or_load(("spacy", task), load)
+
+def get_stop_words():
+    def load():
+        from nltk.corpus import stopwords
+        return set(stopwords.words('english'))
+    return _get_or_load(("stopwords", "english"), load)
+
+def set_hf_backend(backend):
+    """Default backend for get_hf_pipeline: "torch" (fp32), "int8" (dynamic quantization) or "onnx"."""
+    global HF_BACKEND
+    if backend not in HF_BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {HF_BACKENDS}")
+    HF_BACKEND = backend
+
+def _hf_offline():
+    return os.getenv("HF_HUB_OFFLINE", "0") not in ("0", "", "false")
+
+def _load_token_classifier(model, backend):
+    from transformers import AutoTokenizer, pipeline
+
+    offline = _hf_offline()
+    tokenizer = AutoTokenizer.from_pretrained(model, cache_dir=MODEL_CACHE_DIR, local_files_only=offline)
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForTokenClassification
+
+        onnx_dir = os.path.join(MODEL_CACHE_DIR, "onnx", model.replace("/", "__"))
+        if os.path.isdir(onnx_dir):
+            classifier = ORTModelForTokenClassification.from_pretrained(onnx_dir)
+        else:
+            # First use exports the PyTorch weights once and keeps the ONNX graph for offline runs
+            classifier = ORTModelForTokenClassification.from_pretrained(
+                model, export=True, cache_dir=MODEL_CACHE_DIR, local_files_only=offline)
+            classifier.save_pretrained(onnx_dir)
+            tokenizer.save_pretrained(onnx_dir)
+    else:
+        from transformers import AutoModelForTokenClassification
+
+        classifier = AutoModelForTokenClassification.from_pretrained(
+            model, cache_dir=MODEL_CACHE_DIR, local_files_only=offline)
+        classifier.eval()
+        if backend == "int8":
+            import torch
+            classifier = torch.quantization.quantize_dynamic(classifier, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("token-classification", model=classifier, tokenizer=tokenizer, aggregation_strategy="first")
+
+def get_hf_pipeline(name, backend=None):
+    """
+    Token-classification pipeline (aggregation_strategy="first") for a HF_MODELS key or model id.
+    Weights are cached under MODEL_CACHE_DIR; set HF_HUB_OFFLINE=1 to load from there only.
+    """
+    model = HF_MODELS.get(name, name)
+    backend = backend or HF_BACKEND
+    def load():
+        print(f"Loading {model} ({backend})")
+        return _load_token_classifier(model, backend)
+    return _get_or_load(("hf", model, backend), load)
+
+def loaded_models():
+    return list(_models)
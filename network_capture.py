@@ -0,0 +1,171 @@
+import base64
+import html
+import json
+import re
+from datetime import datetime
+
+# Network-response capture: LinkedIn fills the job pane from voyager API
+# responses, so in "network" mode we read the job posting JSON directly
+# instead of scraping the rendered DOM back out.
+
+JOB_POSTING_URL = re.compile(r"/voyager/api/(jobs/jobPostings/\d+|graphql\?.*voyagerJobsDashJobPostings)")
+JOB_POSTING_URN = re.compile(r"jobPosting:(\d+)")
+
+# Resource types that are never needed to read job data
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+def is_job_posting_response(url):
+    return bool(JOB_POSTING_URL.search(url))
+
+def block_heavy_resources(context):
+    """Abort image/font/media requests for every page of the context."""
+    def handle_route(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+    context.route("**/*", handle_route)
+
+
+def text_to_html(text):
+    """Voyager returns the description as plain text; wrap lines so the section classifier can read it."""
+    lines = [line.strip() for line in text.splitlines()]
+    return "".join(f"<p>{html.escape(line)}</p>" for line in lines if line)
+
+def _iter_objects(payload):
+    """Yield every dict in a (possibly normalized) voyager payload."""
+    stack = [payload]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            yield obj
+            stack.extend(obj.values())
+        elif isinstance(obj, list):
+            stack.extend(obj)
+
+def _company_name(posting, objects_by_urn):
+    details = posting.get("companyDetails") or {}
+    for obj in _iter_objects(details):
+        if obj.get("name"):
+            return obj["name"]
+        urn = obj.get("company") or obj.get("*companyResolutionResult")
+        if isinstance(urn, str) and objects_by_urn.get(urn, {}).get("name"):
+            return objects_by_urn[urn]["name"]
+    return "N/A"
+
+def parse_job_posting_payload(payload):
+    """
+    Build job fields from a job-posting API payload.
+    Returns {job_id: {"title", "link", "company", "post_date", "description", "applicants"}}.
+    """
+    objects = list(_iter_objects(payload))
+    objects_by_urn = {o["entityUrn"]: o for o in objects if isinstance(o.get("entityUrn"), str)}
+
+    jobs = {}
+    for obj in objects:
+        if not obj.get("title") or "description" not in obj:
+            continue
+        urn_match = JOB_POSTING_URN.search(str(obj.get("entityUrn") or obj.get("jobPostingUrn") or ""))
+        job_id = str(obj.get("jobPostingId") or (urn_match.group(1) if urn_match else ""))
+        if not job_id:
+            continue
+
+        description = obj.get("description")
+        if isinstance(description, dict):
+            description = description.get("text", "")
+        listed_at = obj.get("listedAt") or obj.get("originalListedAt")
+        applies = obj.get("applies")
+
+        jobs[job_id] = {
+            "title": obj["title"],
+            "link": f"/jobs/view/{job_id}/",
+            "company": _company_name(obj, objects_by_urn),
+            "post_date": datetime.fromtimestamp(listed_at / 1000).strftime('%Y-%m-%d') if listed_at else "N/A",
+            "description": text_to_html(description) if description else "No description found",
+            "applicants": f"{applies} applicants" if applies is not None else "N/A",
+        }
+    return jobs
+
+
+class JobResponseCollector:
+    """Collects parsed job postings from page responses, keyed by job id."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.responses = 0
+        self.errors = 0
+
+    def handle_payload(self, url, payload):
+        if not is_job_posting_response(url):
+            return 0
+        self.responses += 1
+        parsed = parse_job_posting_payload(payload)
+        self.jobs.update(parsed)
+        return len(parsed)
+
+    def on_response(self, response):
+        if response.status != 200 or not is_job_posting_response(response.url):
+            return
+        try:
+            self.handle_payload(response.url, response.json())
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Could not parse job response {response.url}: {e}")
+
+    def attach(self, page):
+        page.on("response", self.on_response)
+
+    def pop(self, job_id):
+        return self.jobs.pop(job_id, None)
+
+
+def replay_har(har_path, collector=None):
+    """Feed the job-posting responses recorded in a HAR file to a collector (offline, no browser)."""
+    collector = collector or JobResponseCollector()
+    with open(har_path, "r", encoding="utf-8") as f:
+        har = json.load(f)
+
+    for entry in har.get("log", {}).get("entries", []):
+        url = entry.get("request", {}).get("url", "")
+        content = entry.get("response", {}).get("content", {})
+        text = content.get("text")
+        if not text or not is_job_posting_response(url):
+            continue
+        if content.get("encoding") == "base64":
+            text = base64.b64decode(text).decode("utf-8")
+        try:
+            collector.handle_payload(url, json.loads(text))
+        except ValueError as e:
+            collector.errors += 1
+            print(f"⚠️ Bad JSON in HAR entry {url}: {e}")
+    return collector
+
+def jobs_from_har(har_path, job_dict=None, query="replay"):
+    """Build job_dict entries from a recorded HAR file, same shape as the live scraper."""
+    from main import record_job
+
+    job_dict = {} if job_dict is None else job_dict
+    collector = replay_har(har_path)
+    for job_id, job in collector.jobs.items():
+        record_job(job_dict, job_id, job["title"], job["link"], job["company"],
+                   job["post_date"], job["description"], job["applicants"], query)
+    print(f"Replayed {collector.responses} responses -> {len(collector.jobs)} jobs ({collector.errors} errors)")
+    return job_dict
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build job data from recorded HAR files')
+    parser.add_argument('har', nargs='+', help='HAR file(s) recorded with record_har_path')
+    parser.add_argument('--output', type=str, default='job_data_replay.json')
+    parser.add_argument('--query', type=str, default='replay')
+    args = parser.parse_args()
+
+    job_dict = {}
+    for har_path in args.har:
+        jobs_from_har(har_path, job_dict, query=args.query)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(job_dict, f, indent=4, ensure_ascii=False)
+    print(f"Jobs saved to {args.output}")
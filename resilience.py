@@ -0,0 +1,90 @@
+import time
+from collections import Counter
+
+# Fault isolation for the card loop: a failing card is retried with
+# exponential backoff (re-querying its element handle each time) and skipped
+# with a recorded reason after N attempts. Only systemic failures - logged
+# out, captcha / checkpoint, or too many consecutive card failures - abort
+# the run, via the circuit breaker.
+
+class SystemicFailure(Exception):
+    """Raised when continuing the run is pointless (logout, captcha, repeated failures)."""
+
+
+class RunStats:
+    def __init__(self):
+        self.counts = Counter()
+        self.skipped = []  # (job id or card index, reason)
+
+    def success(self):
+        self.counts["success"] += 1
+
+    def retry(self):
+        self.counts["retry"] += 1
+
+    def skip(self, key, reason):
+        self.counts["skip"] += 1
+        self.skipped.append((key, reason))
+
+    def print_report(self):
+        print(f"📊 Run stats: success={self.counts['success']} retry={self.counts['retry']} "
+              f"skip={self.counts['skip']}")
+        for key, reason in self.skipped:
+            print(f"   skipped {key}: {reason}")
+
+
+class CircuitBreaker:
+    # URL fragments LinkedIn redirects to when the session is gone or challenged
+    BLOCKED_URL_PARTS = ("/login", "/authwall", "/checkpoint/challenge", "/uas/login")
+    CAPTCHA_SELECTORS = ("iframe[src*='captcha']", "#captcha-internal", "form#challenge")
+
+    def __init__(self, max_consecutive_failures=5):
+        self.max_consecutive_failures = max_consecutive_failures
+        self.consecutive_failures = 0
+
+    def check(self, page):
+        """Raise SystemicFailure if the page shows a logout or captcha state."""
+        if any(part in page.url for part in self.BLOCKED_URL_PARTS):
+            raise SystemicFailure(f"redirected to {page.url}")
+        if page.is_visible("div.sign-in-modal"):
+            raise SystemicFailure("logged out (sign-in modal)")
+        for selector in self.CAPTCHA_SELECTORS:
+            if page.query_selector(selector):
+                raise SystemicFailure("captcha / security challenge")
+
+    def record_success(self):
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.max_consecutive_failures:
+            raise SystemicFailure(f"{self.consecutive_failures} consecutive cards failed")
+
+
+def run_with_retry(fn, page, key, stats, breaker, attempts=3, base_delay=1.0, on_error=None):
+    """
+    Call fn(attempt) up to `attempts` times with exponential backoff between tries.
+    Returns fn's result, or "skip" after the last failure. SystemicFailure is never retried.
+    on_error(key, exception) is called for every failed attempt.
+    """
+    for attempt in range(attempts):
+        try:
+            result = fn(attempt)
+            breaker.record_success()
+            return result
+        except SystemicFailure:
+            raise
+        except Exception as e:
+            if on_error:
+                on_error(key, e)
+            breaker.check(page)  # a logout looks like a card error, surface it as systemic
+            if attempt + 1 < attempts:
+                stats.retry()
+                delay = base_delay * 2 ** attempt
+                print(f"🔁 Retrying {key} in {delay:.0f}s ({e})")
+                time.sleep(delay)
+            else:
+                stats.skip(key, str(e).splitlines()[0] if str(e) else type(e).__name__)
+                print(f"⏭️ Skipping {key} after {attempts} attempts: {e}")
+                breaker.record_failure()
+                return "skip"
@@ -0,0 +1,141 @@
+from playwright.sync_api import sync_playwright
+import heapq
+import itertools
+import json
+import random
+import time
+
+from instrumentation import INSTRUMENTATION
+from job_store import JobStore
+from main import open_context, scrape_query
+from resilience import RunStats, CircuitBreaker, SystemicFailure
+from seen_index import SeenIndex
+from waits import WAIT_STATS
+
+# Multi-query scheduler: runs a list of (query, location, max_jobs) searches in
+# one browser context / cookie session, dedupes job ids across the queries of
+# a run, paces every request through one global rate limiter, and re-queues
+# failed queries with exponential backoff.
+
+class RateLimiter:
+    """Global pacing: at least min_interval + uniform(0, jitter) seconds between requests."""
+
+    def __init__(self, min_interval=1.0, jitter=1.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.next_allowed = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if now < self.next_allowed:
+            time.sleep(self.next_allowed - now)
+        self.next_allowed = time.monotonic() + self.min_interval + random.uniform(0, self.jitter)
+
+
+class ScrapeTask:
+    def __init__(self, query, location="Singapore", max_jobs=25):
+        self.query = query
+        self.location = location
+        self.max_jobs = max_jobs
+        self.attempts = 0
+        self.error = None
+
+    def __repr__(self):
+        return f"ScrapeTask({self.query!r}, {self.location!r}, max_jobs={self.max_jobs})"
+
+
+def run_schedule(tasks, job_dict, index=None, mode="dom", rate_limiter=None,
+                 max_attempts=3, backoff=60.0, screenshots=False, report=None):
+    """
+    Run every task on one shared browser context.
+    A failed task goes back in the queue after backoff * 2**(attempts-1) seconds (jittered);
+    after max_attempts it is reported as failed. Returns (job_dict, failed tasks).
+    """
+    rate_limiter = rate_limiter or RateLimiter()
+    INSTRUMENTATION.reset()
+    stats = RunStats()
+    breaker = CircuitBreaker()
+    seen_job_ids = set()
+    failed = []
+    order = itertools.count()
+    queue = [(0.0, next(order), task) for task in tasks]  # (not_before, seq, task)
+    heapq.heapify(queue)
+
+    with sync_playwright() as p:
+        context, page, collector = open_context(p, mode=mode)
+        try:
+            while queue:
+                not_before, _, task = heapq.heappop(queue)
+                delay = not_before - time.monotonic()
+                if delay > 0:
+                    print(f"⏳ Waiting {delay:.0f}s before retrying {task}")
+                    time.sleep(delay)
+
+                task.attempts += 1
+                print(f"▶️ {task} (attempt {task.attempts})")
+                try:
+                    result = scrape_query(page, job_dict, task.query, task.location, task.max_jobs,
+                                          collector=collector, index=index,
+                                          seen_job_ids=seen_job_ids, throttle=rate_limiter.wait,
+                                          stats=stats, breaker=breaker, screenshots=screenshots)
+                except SystemicFailure as e:
+                    task.error = str(e)
+                    result = None
+                except Exception as e:
+                    result = e
+                if result is None:
+                    # Logged out / challenged: every remaining query would fail the same way
+                    print("❌ Session unusable! Stopping the schedule.")
+                    failed.extend([task] + [t for _, _, t in queue])
+                    break
+                if isinstance(result, Exception):
+                    task.error = str(result)
+                    if task.attempts < max_attempts:
+                        retry_in = backoff * 2 ** (task.attempts - 1) * random.uniform(0.8, 1.2)
+                        print(f"⚠️ {task} failed ({result}), retrying in {retry_in:.0f}s")
+                        heapq.heappush(queue, (time.monotonic() + retry_in, next(order), task))
+                    else:
+                        print(f"❌ {task} failed after {task.attempts} attempts: {result}")
+                        failed.append(task)
+        finally:
+            context.close()
+
+    print(f"✅ Schedule done: {len(seen_job_ids)} unique jobs, {len(failed)} failed queries")
+    INSTRUMENTATION.count("retries", stats.counts["retry"])
+    stats.print_report()
+    WAIT_STATS.print_report()
+    INSTRUMENTATION.print_report()
+    if report:
+        INSTRUMENTATION.write_report(report)
+    return job_dict, failed
+
+
+def load_tasks(file_path):
+    """Tasks file: JSON list of {"query", "location", "max_jobs"}."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [ScrapeTask(t["query"], t.get("location", "Singapore"), t.get("max_jobs", 25))
+                for t in json.load(f)]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape several LinkedIn searches in one browser session')
+    parser.add_argument('--tasks', type=str, help='JSON list of {"query", "location", "max_jobs"}')
+    parser.add_argument('--db', type=str, default='jobs.db')
+    parser.add_argument('--mode', type=str, default='dom', choices=['dom', 'network'])
+    parser.add_argument('--interval', type=float, default=1.0, help='Minimum seconds between requests')
+    parser.add_argument('--jitter', type=float, default=1.0, help='Extra random seconds between requests')
+    parser.add_argument('--screenshots', action='store_true', help='Save a screenshot when a card fails')
+    parser.add_argument('--report', type=str, default='run_report.json', help='Run report (.json or .csv)')
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.tasks) if args.tasks else [ScrapeTask("Data Science", "Singapore", 200)]
+    index = SeenIndex()
+    with JobStore(args.db) as store:
+        for task in tasks:
+            index.seed(task.query, task.location, store)
+        run_schedule(tasks, store, index=index, mode=args.mode,
+                     rate_limiter=RateLimiter(args.interval, args.jitter),
+                     screenshots=args.screenshots, report=args.report)
+        print(f"{len(store)} jobs in {args.db}")
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+# Persistent cache for parsed description sections.
+#
+# Re-scraped and reposted jobs carry identical description HTML, so sections
+# are cached under sha256(classifier version + parser + html). Bumping
+# description.CLASSIFIER_VERSION invalidates every entry. The cache is a
+# single SQLite file; when it grows past max_bytes the least recently used
+# entries are evicted.
+
+CACHE_FILE = "section_cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sections_last_access ON sections(last_access);
+"""
+
+def content_key(description_html, version, parser="html.parser"):
+    digest = hashlib.sha256()
+    digest.update(f"{version}\0{parser}\0".encode("utf-8"))
+    digest.update(description_html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SectionCache:
+    def __init__(self, path=CACHE_FILE, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM sections").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_many(self, keys):
+        """Return {key: sections} for the keys that are cached, and touch them for LRU."""
+        found = {}
+        keys = list(set(keys))
+        for start in range(0, len(keys), 500):  # stay under SQLite's host parameter limit
+            chunk = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, value FROM sections WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE sections SET last_access = ? WHERE key = ?",
+                                  [(now, key) for key in found])
+            self.conn.commit()
+        return found
+
+    def put_many(self, items):
+        """Store {key: sections}, then evict least recently used entries if over max_bytes."""
+        now = time.time()
+        rows = []
+        for key, sections in items.items():
+            value = json.dumps(sections, ensure_ascii=False)
+            rows.append((key, value, len(value), now))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO sections (key, value, size, last_access) VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM sections").fetchone()[0]
+        if self.total_bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+
+    def evict(self, target_bytes):
+        """Delete least recently used entries until the cache holds at most target_bytes."""
+        removed = 0
+        cursor = self.conn.execute("SELECT key, size FROM sections ORDER BY last_access")
+        doomed = []
+        for key, size in cursor:
+            if self.total_bytes - removed <= target_bytes:
+                break
+            doomed.append((key,))
+            removed += size
+        self.conn.executemany("DELETE FROM sections WHERE key = ?", doomed)
+        self.conn.commit()
+        self.total_bytes -= removed
+        print(f"🧹 Evicted {len(doomed)} cached descriptions ({removed} bytes)")
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        print(f"Section cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate), "
+              f"{self.total_bytes / 1e6:.1f} MB")
@@ -0,0 +1,104 @@
+import json
+import os
+from datetime import datetime
+
+from job_store import JobStore
+
+# Persistent seen-id index for incremental crawls, keyed by (query, location).
+#
+# Each entry keeps:
+#   known        job_id -> post date, for every job of every *finished* crawl
+#   in_progress  job_id -> post date, for the crawl currently running
+#   page         last fully processed results page of the running crawl
+#   last_post_date  newest post date seen so far
+#
+# Results are sorted by date (sortBy=DD), so once a crawl reaches jobs that are
+# already in `known` everything after them is old and the crawl can stop.
+# The index is written after every page so a crashed crawl resumes at `page`.
+# An in_progress id is skipped on resume, so its job must be durably stored
+# before the id is flushed: a JobStore commits every job as it is recorded,
+# a plain job_dict needs a `persist` callback that writes it out first.
+
+INDEX_FILE = "seen_index.json"
+PAGE_SIZE = 25  # LinkedIn search results per page (&start= offset step)
+
+class SeenIndex:
+    def __init__(self, path=INDEX_FILE, persist=None):
+        """persist: optional callable storing the scraped jobs, run before every index write."""
+        self.path = path
+        self.persist = persist
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(query, location):
+        return f"{query.strip().lower()}|{location.strip().lower()}"
+
+    def entry(self, query, location):
+        return self.entries.setdefault(self.key(query, location), {
+            "known": {},
+            "in_progress": {},
+            "page": 0,
+            "last_post_date": None,
+            "updated_at": None,
+        })
+
+    def seed(self, query, location, job_dict):
+        """
+        Mark jobs from an existing job_dict or JobStore as known for this query, once: a query
+        the index already tracks is left alone, or the jobs an interrupted crawl stored would
+        turn up as known on resume and end it early.
+        """
+        if self.key(query, location) in self.entries:
+            return
+        entry = self.entry(query, location)
+        if isinstance(job_dict, JobStore):
+            for job_id, post_date in job_dict.iter_keyword_jobs(query):
+                entry["known"].setdefault(job_id, post_date)
+            return
+        for job_id, job in job_dict.items():
+            if any(s.get("keyword") == query for s in job.get("snapshots", [])):
+                entry["known"].setdefault(job_id, job.get("Post Date", "N/A"))
+
+    def status(self, query, location, job_id):
+        """'known' (from a finished crawl), 'in_progress' (this crawl) or 'new'."""
+        entry = self.entry(query, location)
+        if job_id in entry["known"]:
+            return "known"
+        if job_id in entry["in_progress"]:
+            return "in_progress"
+        return "new"
+
+    def add(self, query, location, job_id, post_date="N/A"):
+        entry = self.entry(query, location)
+        entry["in_progress"][job_id] = post_date
+        if post_date != "N/A" and (entry["last_post_date"] is None or post_date > entry["last_post_date"]):
+            entry["last_post_date"] = post_date
+
+    def resume_page(self, query, location):
+        return self.entry(query, location)["page"]
+
+    def checkpoint(self, query, location, page):
+        """Record that `page` results pages are done and flush to disk."""
+        self.entry(query, location)["page"] = page
+        self.save(query, location)
+
+    def finish(self, query, location):
+        """Crawl reached the end or already-known jobs: fold in_progress into known."""
+        entry = self.entry(query, location)
+        entry["known"].update(entry["in_progress"])
+        entry["in_progress"] = {}
+        entry["page"] = 0
+        self.save(query, location)
+
+    def save(self, query=None, location=None):
+        if self.persist:
+            self.persist()  # jobs first, so no flushed id outlives its job
+        if query is not None:
+            self.entry(query, location)["updated_at"] = datetime.now().isoformat()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)  # atomic, a crash never leaves a half-written index
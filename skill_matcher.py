@@ -0,0 +1,363 @@
+import csv
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_right
+from collections import deque, namedtuple
+from functools import lru_cache
+
+# Dictionary skill matcher: Aho-Corasick over raw strings, no spaCy.
+#
+# A taxonomy maps canonical skills to aliases ("Python 3" -> Python,
+# "k8s" -> Kubernetes). Every alias is compiled into one automaton that runs
+# over the lowercased sentence once; transitions are resolved lazily through
+# the failure links and memoized, so the hot loop is a dict lookup per char.
+#
+# Word boundaries: an alias that starts (ends) with a word character only
+# matches when the character before (after) it is not a word character, so
+# "R" is not found in "Rust" and "Java" not in "JavaScript". "&" also blocks
+# on both sides ("R&D") and "+"/"#" block on the right (no "C" in "C++"/"C#").
+# Short aliases (<= case_sensitive_max_len chars, e.g. "R", "ML") must match
+# case-exactly. Hyphens count as spaces ("machine-learning"). Overlapping
+# matches resolve leftmost-longest.
+#
+# Taxonomy files (SKILL_TAXONOMY=<path> replaces the default one):
+#   JSON  [{"id": "python", "name": "Python", "aliases": ["Python 3"]}, ...]
+#         or {"Python": ["Python 3", ...], ...}
+#   CSV   columns name, aliases ("|"-separated), optional id
+#
+# Requirement cues ("nice to have", "not required", "must") are compiled into
+# the same automaton, so one scan finds skills and cues together. When a
+# sentence has cues, each skill is labelled required / optional / negated by
+# the nearest cue in its scope (a negation prefix such as "no experience with"
+# overrides everything after it): clauses end at ; ! ? newlines, sentence
+# periods and "but"/"however"/...; inside a clause, comma-separated phrases
+# are joined only when they continue a list of skills ("Python, SQL or R is a
+# plus"), so "Python required, R nice to have" keeps Python required.
+# Skills without a cue in scope are required.
+
+SkillMatch = namedtuple("SkillMatch", ["skill_id", "name", "start", "end", "text", "label"],
+                        defaults=("required",))
+
+LABELS = ["negated", "optional", "required"]  # tie-break order for equally close cues
+CUES = {
+    "negated": ["not required", "not necessary", "not needed", "not mandatory"],
+    # negate every skill after them in scope, whatever cue follows ("No experience with X required")
+    "negation_prefix": ["no experience", "without", "do not need", "don't need", "no need"],
+    "optional": ["optional", "nice to have", "good to have", "a plus", "bonus", "preferred", "preferably",
+                 "desirable", "an advantage", "advantageous", "ideally"],
+    "required": ["required", "must", "must have", "mandatory", "essential", "need", "needed"],
+    "break": ["but", "however", "although", "though", "whereas", "while"],
+}
+CUE_KINDS = list(CUES)
+BOUNDARY_PATTERN = re.compile(r"[;!?\n]|\.(?=\s|$)|,")
+LIST_LEAD_PATTERN = re.compile(r"\s*(?:(?:and|or|and/or|&)\s+)?", re.IGNORECASE)
+
+# Aliases for the default taxonomy (baseline.HARD_SKILL_LIST)
+DEFAULT_ALIASES = {
+    "Python": ["Python 3", "Python3", "Python 2"],
+    "C++": ["cpp"],
+    "Excel": ["MS Excel", "Microsoft Excel"],
+    "Power BI": ["PowerBI", "Power-BI"],
+    "TensorFlow": ["TensorFlow 2", "TF2"],
+    "AWS": ["Amazon Web Services"],
+    "Azure": ["Microsoft Azure"],
+    "Kubernetes": ["k8s"],
+    "Natural Language Processing": ["NLP"],
+    "Machine Learning": ["ML"],
+    "Data Analysis": ["Data Analytics"],
+}
+
+LEFT_JOINERS = "&"
+RIGHT_JOINERS = "&+#"
+SEPARATORS = str.maketrans({c: " " for c in "-\t\n\r\x0b\x0c\xa0\u2009\u202f"})
+
+def _is_word(ch):
+    return ch.isalnum() or ch == "_"
+
+def normalize_alias(alias):
+    return re.sub(r"\s+", " ", alias.strip().lower().translate(SEPARATORS))
+
+def _lower(text):
+    """Lowercase without changing the length, so offsets stay valid."""
+    lowered = text.translate(SEPARATORS).lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text.translate(SEPARATORS))
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9+#.]+", "-", name.lower()).strip("-")
+
+
+class SkillMatcher:
+    def __init__(self, case_sensitive_max_len=2, cues=CUES):
+        """cues: {kind: phrases} for requirement labelling (kinds from CUE_KINDS), None to skip labelling."""
+        self.case_sensitive_max_len = case_sensitive_max_len
+        self.skill_ids = []
+        self.names = []
+        self._index = {}
+        self._aliases = {}  # normalized alias -> list of (skill index, alias)
+        self._cues = {normalize_alias(phrase): CUE_KINDS.index(kind)
+                      for kind, phrases in (cues or {}).items() for phrase in phrases}
+        self._automaton = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, aliases=(), skill_id=None):
+        """Register a canonical skill (its name is an alias too); returns its index."""
+        skill_id = skill_id or slugify(name)
+        if skill_id not in self._index:
+            self._index[skill_id] = len(self.names)
+            self.skill_ids.append(skill_id)
+            self.names.append(name)
+        skill = self._index[skill_id]
+        for alias in [name, *aliases]:
+            if alias and alias.strip():
+                entries = self._aliases.setdefault(normalize_alias(alias), [])
+                if (skill, alias.strip()) not in entries:
+                    entries.append((skill, alias.strip()))
+        self._automaton = None
+        return skill
+
+    @property
+    def version(self):
+        """Stable hash of the taxonomy and settings, for cache keys."""
+        payload = json.dumps([self.case_sensitive_max_len, self.skill_ids, self.names,
+                              sorted((k, v) for k, v in self._aliases.items()), sorted(self._cues.items())],
+                             ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+    # -- automaton -----------------------------------------------------------
+
+    def compile(self):
+        goto, fail, out = [{}], [0], [[]]
+
+        def insert(pattern):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                state = nxt
+            return state
+
+        for pattern, entries in self._aliases.items():
+            state = insert(pattern)
+            for skill, alias in entries:
+                exact = alias if len(alias) <= self.case_sensitive_max_len else None
+                entry = (len(pattern), skill, exact, _is_word(pattern[0]), _is_word(pattern[-1]))
+                if entry not in out[state]:
+                    out[state].append(entry)
+        # cues are entries with a negative "skill": ~kind
+        for pattern, kind in self._cues.items():
+            out[insert(pattern)].append((len(pattern), ~kind, None, _is_word(pattern[0]), _is_word(pattern[-1])))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._automaton = ([dict(g) for g in goto], goto, fail, out)
+        return self
+
+    def _step(self, state, ch):
+        delta, goto, fail, _ = self._automaton
+        s = state
+        while ch not in goto[s] and s:
+            s = fail[s]
+        nxt = delta[state][ch] = goto[s].get(ch, 0)
+        return nxt
+
+    # -- matching ------------------------------------------------------------
+
+    def find(self, text, overlapping=False):
+        """All skill mentions in text as labelled SkillMatch tuples, in text order."""
+        if self._automaton is None:
+            self.compile()
+        delta, _, _, out = self._automaton
+        step = self._step
+        lowered = _lower(text)
+        n = len(text)
+        candidates = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            nxt = delta[state].get(ch)
+            state = step(state, ch) if nxt is None else nxt
+            if out[state]:
+                end = i + 1
+                for length, skill, exact, check_left, check_right in out[state]:
+                    start = end - length
+                    if check_left and start > 0 and (_is_word(text[start - 1]) or text[start - 1] in LEFT_JOINERS):
+                        continue
+                    if check_right and end < n and (_is_word(text[end]) or text[end] in RIGHT_JOINERS):
+                        continue
+                    if exact is not None and text[start:end] != exact:
+                        continue
+                    candidates.append((start, end, skill))
+
+        if not overlapping:
+            candidates.sort(key=lambda c: (c[0], -c[1]))
+            kept, last_end = [], 0
+            for start, end, skill in candidates:
+                if start >= last_end:
+                    kept.append((start, end, skill))
+                    last_end = end
+            candidates = kept
+        else:
+            candidates.sort()
+
+        skills = [c for c in candidates if c[2] >= 0]
+        cues = [(start, end, CUE_KINDS[~kind]) for start, end, kind in candidates if kind < 0]
+        labels = label_skills(text, skills, cues) if cues else ["required"] * len(skills)
+        return [SkillMatch(self.skill_ids[skill], self.names[skill], start, end, text[start:end], label)
+                for (start, end, skill), label in zip(skills, labels)]
+
+    def labeled_skills(self, text):
+        """
+        {canonical name: label} in order of appearance; a skill mentioned several times
+        keeps its strongest label (required > optional > negated).
+        """
+        labeled = {}
+        for match in self.find(text):
+            if LABELS.index(match.label) > LABELS.index(labeled.get(match.name, "negated")):
+                labeled[match.name] = match.label
+            else:
+                labeled.setdefault(match.name, match.label)
+        return labeled
+
+    def skills(self, text, labels=("required", "optional")):
+        """Canonical names of the skills mentioned in text with one of `labels`, unique, in order."""
+        return [name for name, label in self.labeled_skills(text).items() if label in labels]
+
+    def skills_batch(self, texts, labels=("required", "optional")):
+        return [self.skills(text, labels) for text in texts]
+
+    # -- taxonomies ----------------------------------------------------------
+
+    @classmethod
+    def from_entries(cls, entries, **kwargs):
+        """entries: iterable of (skill_id or None, name, aliases)."""
+        matcher = cls(**kwargs)
+        for skill_id, name, aliases in entries:
+            matcher.add(name, aliases, skill_id)
+        return matcher
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        return cls.from_entries(load_taxonomy(path), **kwargs)
+
+    @classmethod
+    def default(cls, **kwargs):
+        from baseline import HARD_SKILL_LIST
+
+        return cls.from_entries(((None, name, DEFAULT_ALIASES.get(name, [])) for name in HARD_SKILL_LIST), **kwargs)
+
+
+def label_skills(text, skills, cues):
+    """
+    Label per skill (start, end, index) from the cues (start, end, kind) found in the same
+    scan. See the module comment for the scoping rules.
+    """
+    breaks = [(m.start(), m.group() == ",") for m in BOUNDARY_PATTERN.finditer(text)]
+    breaks += [(start, False) for start, end, kind in cues if kind == "break"]
+    breaks.sort()
+    positions = [position for position, _ in breaks]
+
+    # phrase k spans breaks k-1..k; link it to phrase k-1 when the comma between them
+    # sits inside a list of skills
+    phrase_skills = {}
+    for start, end, _ in skills:
+        phrase_skills.setdefault(bisect_right(positions, start), []).append((start, end))
+    group = list(range(len(positions) + 1))
+    for k in range(1, len(group)):
+        position, comma = breaks[k - 1]
+        previous, current = phrase_skills.get(k - 1), phrase_skills.get(k)
+        if (comma and previous and current and not text[previous[-1][1]:position].strip()
+                and LIST_LEAD_PATTERN.fullmatch(text[position + 1:current[0][0]])):
+            group[k] = group[k - 1]
+
+    group_cues = {}
+    for start, end, kind in cues:
+        if kind != "break":
+            group_cues.setdefault(group[bisect_right(positions, start)], []).append((start, end, kind))
+
+    labels = []
+    for start, end, _ in skills:
+        scoped = group_cues.get(group[bisect_right(positions, start)], [])
+        if any(kind == "negation_prefix" and cue_end <= start for _, cue_end, kind in scoped):
+            labels.append("negated")
+            continue
+        scoped = [cue for cue in scoped if cue[2] != "negation_prefix"]
+        if not scoped:
+            labels.append("required")
+            continue
+        distance = lambda cue: start - cue[1] if cue[1] <= start else max(cue[0] - end, 0)
+        labels.append(min(scoped, key=lambda cue: (distance(cue), LABELS.index(cue[2])))[2])
+    return labels
+
+def load_taxonomy(path):
+    """(skill_id or None, name, aliases) entries of a JSON or CSV taxonomy file."""
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                aliases = [a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()]
+                yield row.get("id") or None, row["name"].strip(), aliases
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for name, aliases in data.items():
+            yield None, name, aliases
+    else:
+        for entry in data:
+            yield entry.get("id"), entry["name"], entry.get("aliases", [])
+
+@lru_cache(maxsize=None)
+def get_skill_matcher():
+    """Process-wide matcher: the SKILL_TAXONOMY file if set, else the default taxonomy."""
+    path = os.getenv("SKILL_TAXONOMY")
+    matcher = SkillMatcher.from_file(path) if path else SkillMatcher.default()
+    return matcher.compile()
+
+
+if __name__ == '__main__':
+    import argparse
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description='Match taxonomy skills in text')
+    parser.add_argument('--taxonomy', type=str, default=None, help='JSON/CSV taxonomy (default: built-in)')
+    parser.add_argument('--text', type=str, default=None, help='Text to match')
+    parser.add_argument('--bench', type=int, default=0, help='Benchmark on N synthetic sentences')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matcher = SkillMatcher.from_file(args.taxonomy) if args.taxonomy else SkillMatcher.default()
+    matcher.compile()
+    print(f"{len(matcher)} skills, {len(matcher._aliases)} aliases compiled in {time.perf_counter() - start:.2f}s")
+
+    if args.text:
+        for match in matcher.find(args.text):
+            print(f"{match.start:>4}-{match.end:<4} {match.text!r} -> {match.name} ({match.skill_id}, {match.label})")
+
+    if args.bench:
+        rng = random.Random(0)
+        words = ["experience", "with", "strong", "and", "or", "building", "pipelines", "in", "years", "of"]
+        vocabulary = words * 5 + list(matcher._aliases)
+        sentences = [" ".join(rng.choice(vocabulary) for _ in range(20)) for _ in range(args.bench)]
+        chars = sum(len(s) for s in sentences)
+        start = time.perf_counter()
+        found = sum(len(matcher.find(s)) for s in sentences)
+        elapsed = time.perf_counter() - start
+        print(f"{chars / elapsed / 1e6:.2f}M chars/s, {len(sentences) / elapsed:.0f} sentences/s, {found} matches")
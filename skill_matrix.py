@@ -0,0 +1,296 @@
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from snapshot_store import UNKNOWN, to_epoch
+
+# Job x skill matrix for role-level analysis.
+#
+# Rows are jobs (job_ids, interned), columns are canonical skills (interned),
+# values are the number of Requirements / Preferred lines of the job that
+# mention the skill. Next to the CSR matrix, per-job columns hold the role
+# bucket of the title (ROLE_RULES, int16 index into roles) and the post date
+# (epoch seconds, -1 when unknown). Queries are sparse products over these:
+# top skills per role, co-occurrence, lift / TF-IDF per role, monthly trends.
+#
+# add_jobs() appends rows for unseen job_ids only (a posting's requirements
+# don't change), so the matrix is updated incrementally as jobs are scraped
+# and classified; save() / load() persist it as .npz.
+
+ROLE_RULES = [
+    ("ML Engineer", r"machine learning|\bml\b|mlops|\bai\b|deep learning|computer vision|\bnlp\b"),
+    ("Data Scientist", r"data scien|research scien|applied scien"),
+    ("Data Engineer", r"data engineer|\betl\b|data platform|big data"),
+    ("Data Analyst", r"analyst|analytics|business intelligence|\bbi\b|reporting"),
+    ("Software Engineer", r"software|developer|back.?end|front.?end|full.?stack|engineer"),
+]
+ROLE_PATTERNS = [(role, re.compile(pattern, re.IGNORECASE)) for role, pattern in ROLE_RULES]
+OTHER_ROLE = "Other"
+REQUIREMENT_SECTIONS = ["Requirements", "Preferred / Nice to Have"]
+
+@lru_cache(maxsize=None)
+def role_of(title):
+    """Role bucket of a job title: the first matching ROLE_RULES entry, else "Other"."""
+    for role, pattern in ROLE_PATTERNS:
+        if pattern.search(title or ""):
+            return role
+    return OTHER_ROLE
+
+def hard_skills(sentences):
+    from baseline import extract_hard_skills_batch
+    return extract_hard_skills_batch(sentences)
+
+
+class SkillMatrix:
+    def __init__(self, extractor="hard_skills"):
+        self.extractor = extractor
+        self.job_ids = []
+        self.skills = []
+        self.roles = []
+        self._job_index = {}
+        self._skill_index = {}
+        self._role_index = {}
+        self.job_role = np.empty(0, dtype=np.int16)
+        self.post_ts = np.empty(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def _intern(self, value, values, index):
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def add_jobs(self, records, meta=None, extract=hard_skills):
+        """
+        Append classified jobs ({"job_id", "Requirements": [...], "Preferred / Nice to Have": [...]})
+        that aren't in the matrix yet. Title and post date come from the record's "Title" /
+        "Post Date" or from meta {job_id: (title, post_date)}. extract: list of sentences ->
+        list of skill lists, run once per distinct line (dedupe.SentenceSet).
+        Returns the number of jobs added.
+        """
+        from dedupe import SentenceSet
+
+        meta = meta or {}
+        new_jobs, lines, line_job = [], [], []
+        for record in records:
+            job_id = record["job_id"]
+            if job_id in self._job_index:
+                continue
+            title, post_date = meta.get(job_id, (record.get("Title"), record.get("Post Date")))
+            new_jobs.append((job_id, title, post_date))
+            for section in REQUIREMENT_SECTIONS:
+                for line in record.get(section, []):
+                    lines.append(line)
+                    line_job.append(len(new_jobs) - 1)
+        if not new_jobs:
+            return 0
+
+        sentences = SentenceSet(lines)
+        per_line = sentences.scatter(extract(sentences.unique)) if lines else []
+        rows, cols = [], []
+        for job, skills in zip(line_job, per_line):
+            for skill in set(skills):
+                rows.append(job)
+                cols.append(self._intern(skill, self.skills, self._skill_index))
+
+        start = len(self.job_ids)
+        for job_id, title, post_date in new_jobs:
+            self._job_index[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+        roles = [self._intern(role_of(title), self.roles, self._role_index) for _, title, _ in new_jobs]
+        self.job_role = np.concatenate([self.job_role, np.asarray(roles, dtype=np.int16)])
+        self.post_ts = np.concatenate([self.post_ts, np.asarray(
+            [to_epoch(post_date, "%Y-%m-%d") for _, _, post_date in new_jobs], dtype=np.int64)])
+
+        block = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                                  shape=(len(new_jobs), len(self.skills)))
+        block.sum_duplicates()
+        old = self.matrix.copy()
+        old.resize((start, len(self.skills)))
+        self.matrix = sparse.vstack([old, block], format="csr")
+        return len(new_jobs)
+
+    @classmethod
+    def from_files(cls, classified_file, jobs_file=None, extract=hard_skills):
+        from description import load_classified
+
+        matrix = cls()
+        matrix.add_jobs(load_classified(classified_file), load_job_meta(jobs_file) if jobs_file else None, extract)
+        return matrix
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self, path="skill_matrix.npz"):
+        np.savez_compressed(
+            path, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            shape=np.asarray(self.matrix.shape), job_role=self.job_role, post_ts=self.post_ts,
+            job_ids=np.asarray(self.job_ids, dtype=str), skills=np.asarray(self.skills, dtype=str),
+            roles=np.asarray(self.roles, dtype=str), extractor=np.asarray(self.extractor),
+        )
+
+    @classmethod
+    def load(cls, path="skill_matrix.npz"):
+        with np.load(path) as data:
+            matrix = cls(str(data["extractor"]))
+            matrix.matrix = sparse.csr_matrix((data["data"], data["indices"], data["indptr"]),
+                                              shape=tuple(data["shape"]))
+            matrix.job_role = data["job_role"]
+            matrix.post_ts = data["post_ts"]
+            matrix.job_ids = data["job_ids"].tolist()
+            matrix.skills = data["skills"].tolist()
+            matrix.roles = data["roles"].tolist()
+        matrix._job_index = {job_id: i for i, job_id in enumerate(matrix.job_ids)}
+        matrix._skill_index = {skill: i for i, skill in enumerate(matrix.skills)}
+        matrix._role_index = {role: i for i, role in enumerate(matrix.roles)}
+        return matrix
+
+    # -- queries -------------------------------------------------------------
+
+    def _window(self, since=None, until=None):
+        """Jobs posted within [since, until] (YYYY-MM-DD); all jobs when neither is given."""
+        if since is None and until is None:
+            return np.ones(len(self.job_ids), dtype=bool)
+        keep = self.post_ts != UNKNOWN
+        if since is not None:
+            keep &= self.post_ts >= to_epoch(since, "%Y-%m-%d")
+        if until is not None:
+            keep &= self.post_ts <= to_epoch(until, "%Y-%m-%d")
+        return keep
+
+    def _binary(self, keep=None):
+        """(job has skill) 0/1 matrix, with rows not in `keep` zeroed."""
+        binary = (self.matrix > 0).astype(np.int32)
+        if keep is None:
+            return binary
+        return (sparse.diags(keep.astype(np.int32), dtype=np.int32) @ binary).tocsr()
+
+    def _role_indicator(self):
+        """jobs x roles 0/1 matrix."""
+        return sparse.csr_matrix((np.ones(len(self.job_ids), dtype=np.int32),
+                                  (np.arange(len(self.job_ids)), self.job_role)),
+                                 shape=(len(self.job_ids), len(self.roles)))
+
+    def role_counts(self, since=None, until=None):
+        """(roles x skills job counts, jobs per role)."""
+        keep = self._window(since, until)
+        counts = (self._role_indicator().T @ self._binary(keep)).toarray()
+        return counts, np.bincount(self.job_role[keep], minlength=len(self.roles))
+
+    def top_skills(self, k=10, role=None, since=None, until=None):
+        """
+        {role: [(skill, jobs, share of the role's jobs)]} for every role (or just `role`),
+        top k by job count.
+        """
+        counts, jobs = self.role_counts(since, until)
+        report = {}
+        for r, name in enumerate(self.roles):
+            if role is not None and name != role:
+                continue
+            top = np.argsort(-counts[r], kind="stable")[:k]
+            report[name] = [(self.skills[s], int(counts[r, s]), float(counts[r, s] / jobs[r]) if jobs[r] else 0.0)
+                            for s in top if counts[r, s] > 0]
+        return report
+
+    def cooccurrence(self, role=None):
+        """skills x skills sparse matrix of job counts mentioning both (diagonal: jobs per skill)."""
+        binary = self._binary(None if role is None else self.job_role == self._role_index[role])
+        return (binary.T @ binary).tocsr()
+
+    def top_cooccurring(self, skill, k=10, role=None):
+        """Skills most often required together with `skill`: [(skill, jobs, share of skill's jobs)]."""
+        matrix = self.cooccurrence(role)
+        s = self._skill_index[skill]
+        row = matrix.getrow(s).toarray().ravel()
+        total = row[s]
+        row[s] = 0
+        top = np.argsort(-row, kind="stable")[:k]
+        return [(self.skills[i], int(row[i]), float(row[i] / total) if total else 0.0) for i in top if row[i] > 0]
+
+    def lift(self, role, k=10, min_jobs=3):
+        """
+        Skills over-represented in a role: P(skill | role) / P(skill), for skills the role
+        mentions in at least min_jobs jobs.
+        """
+        counts, jobs = self.role_counts()
+        r = self._role_index[role]
+        overall = counts.sum(axis=0) / max(jobs.sum(), 1)
+        in_role = counts[r] / max(jobs[r], 1)
+        lift = np.divide(in_role, overall, out=np.zeros_like(in_role), where=overall > 0)
+        lift[counts[r] < min_jobs] = 0
+        top = np.argsort(-lift, kind="stable")[:k]
+        return [(self.skills[s], float(lift[s]), int(counts[r, s])) for s in top if lift[s] > 0]
+
+    def tfidf(self, k=10):
+        """Per role, top skills by TF-IDF with roles as documents: share of jobs x log(roles / roles using it)."""
+        counts, jobs = self.role_counts()
+        tf = counts / np.maximum(jobs, 1)[:, None]
+        idf = np.log(len(self.roles) / np.maximum((counts > 0).sum(axis=0), 1))
+        scores = tf * idf
+        return {name: [(self.skills[s], float(scores[r, s])) for s in np.argsort(-scores[r], kind="stable")[:k]
+                       if scores[r, s] > 0]
+                for r, name in enumerate(self.roles)}
+
+    def trend(self, skills, freq="M", role=None):
+        """
+        Share of jobs posted in each period (numpy datetime unit: "M" month, "W" week, "D" day)
+        that mention each skill. Returns (periods, {skill: shares}); jobs without a post date are left out.
+        """
+        dated = self.post_ts != UNKNOWN
+        if role is not None:
+            dated &= self.job_role == self._role_index[role]
+        if not dated.any():
+            return [], {skill: np.empty(0) for skill in skills}
+        period = self.post_ts[dated].astype("datetime64[s]").astype(f"datetime64[{freq}]")
+        periods, column = np.unique(period, return_inverse=True)
+        rows = np.flatnonzero(dated)
+        indicator = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (column, rows)),
+                                      shape=(len(periods), len(self.job_ids)))
+        jobs = np.asarray(indicator.sum(axis=1)).ravel()
+        cols = [self._skill_index[skill] for skill in skills]
+        counts = (indicator @ self._binary()[:, cols]).toarray()
+        return [str(p) for p in periods], {skill: counts[:, i] / jobs for i, skill in enumerate(skills)}
+
+
+def load_job_meta(jobs_file):
+    """{job_id: (title, post_date)} from a JobStore database or job_data JSON file."""
+    if jobs_file.endswith(".db"):
+        from job_store import JobStore
+        with JobStore(jobs_file) as store:
+            return {job["job_id"]: (job["Title"], job["Post Date"]) for job in store.iter_jobs(with_snapshots=False)}
+    from job_store import iter_job_file
+    return {job["job_id"]: (job.get("Title"), job.get("Post Date")) for job in iter_job_file(jobs_file)}
+
+
+if __name__ == '__main__':
+    import argparse
+    from description import load_classified
+
+    parser = argparse.ArgumentParser(description='Build / update the job x skill matrix and print role-level stats')
+    parser.add_argument('--classified', type=str, default='job_data_0414_classify.jsonl')
+    parser.add_argument('--jobs', type=str, default='jobs.db', help='JobStore .db or job_data JSON for titles and post dates')
+    parser.add_argument('--matrix', type=str, default='skill_matrix.npz', help='loaded if present, updated and saved')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--trend', nargs='*', default=[], help='skills to print monthly shares for')
+    args = parser.parse_args()
+
+    matrix = SkillMatrix.load(args.matrix) if os.path.exists(args.matrix) else SkillMatrix()
+    added = matrix.add_jobs(load_classified(args.classified), load_job_meta(args.jobs) if os.path.exists(args.jobs) else None)
+    matrix.save(args.matrix)
+    print(f"{added} new jobs; {len(matrix)} jobs x {len(matrix.skills)} skills saved to {args.matrix}")
+
+    for role, rows in matrix.top_skills(args.top).items():
+        print(f"=== {role} ===")
+        for skill, jobs, share in rows:
+            print(f"   {skill:<30} {jobs:>5} jobs ({share:.0%})")
+        print("   lift: " + ", ".join(f"{skill} {lift:.1f}x" for skill, lift, _ in matrix.lift(role, 5)))
+
+    if args.trend:
+        periods, shares = matrix.trend(args.trend)
+        for i, period in enumerate(periods):
+            print(period + "  " + "  ".join(f"{skill} {shares[skill][i]:.0%}" for skill in args.trend))
@@ -0,0 +1,201 @@
+import re
+from datetime import datetime
+
+import numpy as np
+
+# Columnar snapshot store for applicant tracking.
+#
+# Every re-scrape adds a snapshot {"scraped_at", "applicants", "keyword"} to a
+# job. Here they are kept as parallel numpy arrays instead of nested dicts:
+#   job      int32   index into job_ids
+#   ts       int64   scraped_at as epoch seconds
+#   count    int32   parsed applicant count (-1 when unknown)
+#   over     bool    count is a lower bound ("Over 100 applicants")
+#   keyword  int16   index into keywords (interned)
+# plus a per-job post_ts (epoch seconds of "Post Date", -1 when unknown).
+# Rows are kept sorted by (job, ts) so per-job queries are reduceat calls.
+
+UNKNOWN = -1
+APPLICANTS_PATTERN = re.compile(r"(\d[\d,]*)")
+
+def parse_applicants(raw):
+    """'55 applicants' -> (55, False), 'Over 100 applicants' -> (100, True), 'N/A' -> (-1, False)."""
+    match = APPLICANTS_PATTERN.search(raw or "")
+    if not match:
+        return UNKNOWN, False
+    return int(match.group(1).replace(",", "")), raw.strip().lower().startswith("over")
+
+def to_epoch(value, fmt=None):
+    if not value or value == "N/A":
+        return UNKNOWN
+    dt = datetime.strptime(value, fmt) if fmt else datetime.fromisoformat(value)
+    return int(dt.timestamp())
+
+
+class SnapshotStore:
+    def __init__(self):
+        self.job_ids = []
+        self.keywords = []
+        self._job_index = {}
+        self._keyword_index = {}
+        self.job = np.empty(0, dtype=np.int32)
+        self.ts = np.empty(0, dtype=np.int64)
+        self.count = np.empty(0, dtype=np.int32)
+        self.over = np.empty(0, dtype=bool)
+        self.keyword = np.empty(0, dtype=np.int16)
+        self.post_ts = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _intern(self, value, values, index):
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def extend(self, rows, post_dates=None):
+        """
+        Append snapshot rows (job_id, scraped_at, applicants, keyword), e.g. JobStore.iter_snapshots().
+        post_dates: optional {job_id: "YYYY-MM-DD"}.
+        """
+        job, ts, count, over, keyword = [], [], [], [], []
+        for job_id, scraped_at, applicants, kw in rows:
+            n, is_over = parse_applicants(applicants)
+            job.append(self._intern(job_id, self.job_ids, self._job_index))
+            ts.append(to_epoch(scraped_at))
+            count.append(n)
+            over.append(is_over)
+            keyword.append(self._intern(kw or "", self.keywords, self._keyword_index))
+
+        post_ts = np.full(len(self.job_ids), UNKNOWN, dtype=np.int64)
+        post_ts[:len(self.post_ts)] = self.post_ts
+        for job_id, post_date in (post_dates or {}).items():
+            if job_id in self._job_index:
+                post_ts[self._job_index[job_id]] = to_epoch(post_date, "%Y-%m-%d")
+        self.post_ts = post_ts
+
+        self.job = np.concatenate([self.job, np.asarray(job, dtype=np.int32)])
+        self.ts = np.concatenate([self.ts, np.asarray(ts, dtype=np.int64)])
+        self.count = np.concatenate([self.count, np.asarray(count, dtype=np.int32)])
+        self.over = np.concatenate([self.over, np.asarray(over, dtype=bool)])
+        self.keyword = np.concatenate([self.keyword, np.asarray(keyword, dtype=np.int16)])
+        self._sort()
+        return self
+
+    def _sort(self):
+        order = np.lexsort((self.ts, self.job))
+        for name in ("job", "ts", "count", "over", "keyword"):
+            setattr(self, name, getattr(self, name)[order])
+
+    @classmethod
+    def from_job_dict(cls, job_dict):
+        rows = ((job_id, s.get("scraped_at"), s.get("applicants"), s.get("keyword"))
+                for job_id, job in job_dict.items() for s in job.get("snapshots", []))
+        post_dates = {job_id: job.get("Post Date") for job_id, job in job_dict.items()}
+        return cls().extend(rows, post_dates)
+
+    @classmethod
+    def from_job_store(cls, store):
+        post_dates = {job_id: post_date for job_id, post_date in
+                      store.conn.execute("SELECT job_id, post_date FROM jobs")}
+        return cls().extend(store.iter_snapshots(), post_dates)
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self, path="snapshots.npz"):
+        np.savez_compressed(
+            path, job=self.job, ts=self.ts, count=self.count, over=self.over, keyword=self.keyword,
+            post_ts=self.post_ts, job_ids=np.asarray(self.job_ids, dtype=str),
+            keywords=np.asarray(self.keywords, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path="snapshots.npz"):
+        store = cls()
+        with np.load(path) as data:
+            for name in ("job", "ts", "count", "over", "keyword", "post_ts"):
+                setattr(store, name, data[name])
+            store.job_ids = data["job_ids"].tolist()
+            store.keywords = data["keywords"].tolist()
+        store._job_index = {job_id: i for i, job_id in enumerate(store.job_ids)}
+        store._keyword_index = {kw: i for i, kw in enumerate(store.keywords)}
+        return store
+
+    # -- queries -------------------------------------------------------------
+
+    def _job_starts(self, mask=None):
+        job = self.job if mask is None else self.job[mask]
+        return np.flatnonzero(np.r_[True, job[1:] != job[:-1]]) if len(job) else np.empty(0, dtype=np.int64)
+
+    def growth_rate(self):
+        """
+        Applicants per day between the first and last known snapshot of each job.
+        Returns (job indices, rates); jobs with a single snapshot or zero elapsed time are left out.
+        """
+        mask = self.count != UNKNOWN
+        job, ts, count = self.job[mask], self.ts[mask], self.count[mask]
+        starts = self._job_starts(mask)
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        ends = np.r_[starts[1:], len(job)] - 1
+        elapsed_days = (ts[ends] - ts[starts]) / 86400.0
+        valid = elapsed_days > 0
+        rates = (count[ends] - count[starts])[valid] / elapsed_days[valid]
+        return job[starts][valid], rates
+
+    def time_to_applicants(self, threshold=100):
+        """
+        Days from post date (or first snapshot) until a snapshot shows >= threshold applicants.
+        Returns (job indices, days) for jobs that reached the threshold.
+        """
+        reached = self.count >= threshold
+        if not reached.any():
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        first_ts = np.full(len(self.job_ids), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_ts, self.job, self.ts)
+        hit_ts = np.full(len(self.job_ids), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(hit_ts, self.job[reached], self.ts[reached])
+
+        jobs = np.unique(self.job[reached])
+        origin = np.where(self.post_ts[jobs] != UNKNOWN, self.post_ts[jobs], first_ts[jobs])
+        return jobs, (hit_ts[jobs] - origin) / 86400.0
+
+    def keyword_velocity(self):
+        """Mean applicant growth rate (per day) of jobs scraped under each keyword."""
+        jobs, rates = self.growth_rate()
+        if len(jobs) == 0:
+            return {}
+        # keyword of a job = keyword of its first snapshot
+        job_keyword = np.zeros(len(self.job_ids), dtype=np.int16)
+        starts = self._job_starts()
+        job_keyword[self.job[starts]] = self.keyword[starts]
+        kw = job_keyword[jobs]
+        sums = np.bincount(kw, weights=rates, minlength=len(self.keywords))
+        counts = np.bincount(kw, minlength=len(self.keywords))
+        return {self.keywords[i]: float(sums[i] / counts[i]) for i in np.flatnonzero(counts)}
+
+
+if __name__ == '__main__':
+    import argparse
+    from job_store import JobStore
+
+    parser = argparse.ArgumentParser(description='Build the columnar snapshot store and print applicant trends')
+    parser.add_argument('--db', type=str, default='jobs.db')
+    parser.add_argument('--output', type=str, default='snapshots.npz')
+    parser.add_argument('--threshold', type=int, default=100)
+    args = parser.parse_args()
+
+    with JobStore(args.db) as store:
+        snapshots = SnapshotStore.from_job_store(store)
+    snapshots.save(args.output)
+    print(f"{len(snapshots)} snapshots of {len(snapshots.job_ids)} jobs saved to {args.output}")
+
+    jobs, rates = snapshots.growth_rate()
+    if len(rates):
+        print(f"Median applicant growth: {np.median(rates):.1f}/day over {len(rates)} jobs")
+    jobs, days = snapshots.time_to_applicants(args.threshold)
+    if len(days):
+        print(f"Median time to {args.threshold} applicants: {np.median(days):.1f} days ({len(days)} jobs)")
+    for keyword, velocity in sorted(snapshots.keyword_velocity().items(), key=lambda x: -x[1]):
+        print(f"{keyword}: {velocity:.1f} applicants/day")
@@ -0,0 +1,18 @@
+from description import extract_sections_from_html, extract_sections_with_offsets, iter_section_spans
+
+
+def test_text_node_longer_than_a_chunk_is_one_line():
+    html = "<p>" + "word " * 20000 + "</p>"
+    sections = extract_sections_from_html(html)
+    assert sections == extract_sections_from_html(html, "html.parser")
+    assert len(sections["Other"]) == 1
+    assert sections["Other"][0] == ": " + ("word " * 20000).strip()
+
+def test_chunked_feed_matches_whole_string():
+    html = "<p><strong>Requirements</strong></p><ul><li>Python &amp; SQL</li></ul><p>Other text here</p>"
+    chunked = [html[i:i + 7] for i in range(0, len(html), 7)]
+    assert list(iter_section_spans(chunked)) == list(iter_section_spans(html))
+
+def test_offsets_index_into_cleaned_text():
+    text, spans = extract_sections_with_offsets("<p><b>Skills</b></p><ul><li>Python</li><li>SQL</li></ul>")
+    assert [text[s.start:s.end] for s in spans] == ["Python", "SQL"]
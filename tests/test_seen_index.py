@@ -0,0 +1,39 @@
+from job_store import JobStore
+from seen_index import SeenIndex
+
+QUERY, LOCATION = "Data Science", "Singapore"
+
+def crawl_page(index, store, job_ids):
+    """What scrape_query does per card: store the job, then mark its id in progress."""
+    for job_id in job_ids:
+        store.record_job(job_id, "Title", f"/jobs/view/{job_id}/", "Company",
+                         "2025-04-14", "<p>desc</p>", "N/A", QUERY)
+        index.add(QUERY, LOCATION, job_id, "2025-04-14")
+
+
+def test_resume_after_crash_keeps_scraping(tmp_path):
+    db, path = str(tmp_path / "jobs.db"), str(tmp_path / "seen_index.json")
+    store = JobStore(db)
+    index = SeenIndex(path)
+    index.seed(QUERY, LOCATION, store)
+    crawl_page(index, store, [str(i) for i in range(25)])
+    index.checkpoint(QUERY, LOCATION, 1)
+    crawl_page(index, store, [str(i) for i in range(25, 30)])  # crash on page 1, no checkpoint
+    store.close()
+
+    store = JobStore(db)
+    index = SeenIndex(path)
+    index.seed(QUERY, LOCATION, store)
+    assert index.resume_page(QUERY, LOCATION) == 1
+    assert [index.status(QUERY, LOCATION, str(i)) for i in range(25, 31)] == ["new"] * 6
+    assert index.status(QUERY, LOCATION, "0") == "in_progress"
+    store.close()
+
+def test_seed_marks_stored_jobs_known_on_first_run(tmp_path):
+    with JobStore(str(tmp_path / "jobs.db")) as store:
+        index = SeenIndex(str(tmp_path / "seen_index.json"))
+        crawl_page(index, store, ["1", "2"])
+        index = SeenIndex(str(tmp_path / "seen_index.json"))  # index file never written
+        index.seed(QUERY, LOCATION, store)
+        assert index.status(QUERY, LOCATION, "1") == "known"
+        assert index.status(QUERY, LOCATION, "3") == "new"
@@ -0,0 +1,149 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+# Readiness layer for the scraper: wait for a concrete DOM condition instead of
+# a fixed sleep, fall back to a fixed sleep when the condition times out, and
+# keep a latency histogram per wait so we can see how much sleeping was cut.
+
+# Histogram bucket upper bounds in ms (last bucket is open ended)
+BUCKETS_MS = [50, 100, 250, 500, 1000, 2000, 5000]
+
+class WaitStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.timeouts = defaultdict(int)
+
+    def record(self, name, elapsed_ms, timed_out=False):
+        self.latencies[name].append(elapsed_ms)
+        if timed_out:
+            self.timeouts[name] += 1
+
+    def histogram(self, name):
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for ms in self.latencies[name]:
+            counts[bisect_left(BUCKETS_MS, ms)] += 1
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, counts))
+
+    def summary(self):
+        report = {}
+        for name, values in self.latencies.items():
+            ordered = sorted(values)
+            report[name] = {
+                "count": len(values),
+                "timeouts": self.timeouts[name],
+                "total_ms": round(sum(values), 1),
+                "p50_ms": round(ordered[len(ordered) // 2], 1),
+                "max_ms": round(ordered[-1], 1),
+                "histogram": self.histogram(name),
+            }
+        return report
+
+    def print_report(self):
+        for name, stats in self.summary().items():
+            print(f"⏱️ {name}: n={stats['count']} timeouts={stats['timeouts']} "
+                  f"p50={stats['p50_ms']}ms max={stats['max_ms']}ms total={stats['total_ms']}ms")
+            print("   ", stats["histogram"])
+
+WAIT_STATS = WaitStats()
+
+
+def wait_for_condition(page, name, expression, arg=None, timeout=5000, fallback_ms=1000, stats=WAIT_STATS):
+    """
+    Wait until the JS expression is truthy in the page.
+    On timeout, sleep fallback_ms instead and return False.
+    """
+    start = time.perf_counter()
+    try:
+        page.wait_for_function(expression, arg=arg, timeout=timeout)
+        ready = True
+    except PlaywrightTimeoutError:
+        page.wait_for_timeout(fallback_ms)
+        ready = False
+    stats.record(name, (time.perf_counter() - start) * 1000, timed_out=not ready)
+    return ready
+
+async def wait_for_condition_async(page, name, expression, arg=None, timeout=5000, fallback_ms=1000, stats=WAIT_STATS):
+    """wait_for_condition for async_api pages (async_scraper.py)."""
+    start = time.perf_counter()
+    try:
+        await page.wait_for_function(expression, arg=arg, timeout=timeout)
+        ready = True
+    except PlaywrightTimeoutError:  # same class as playwright.async_api.TimeoutError
+        await page.wait_for_timeout(fallback_ms)
+        ready = False
+    stats.record(name, (time.perf_counter() - start) * 1000, timed_out=not ready)
+    return ready
+
+
+def get_card_job_id(card):
+    return card.get_attribute("data-job-id")
+
+def wait_for_detail_job(page, job_id, timeout=5000, fallback_ms=2000):
+    """Detail pane shows the clicked card: the title link points at /jobs/view/<job_id>."""
+    if not job_id:
+        page.wait_for_timeout(fallback_ms)
+        return False
+    return wait_for_condition(
+        page, "detail_job_id",
+        """id => {
+            const a = document.querySelector('div.job-details-jobs-unified-top-card__job-title a');
+            return !!a && (a.getAttribute('href') || '').includes('/jobs/view/' + id);
+        }""",
+        arg=job_id, timeout=timeout, fallback_ms=fallback_ms,
+    )
+
+def wait_for_description(page, timeout=5000, fallback_ms=500):
+    """Description node is attached and not empty."""
+    return wait_for_condition(
+        page, "description",
+        """() => {
+            const d = document.querySelector('.jobs-description-content__text--stretch');
+            return !!d && d.innerText.trim().length > 0;
+        }""",
+        timeout=timeout, fallback_ms=fallback_ms,
+    )
+
+CARD_GROWTH_JS = "n => document.querySelectorAll('.job-card-container').length > n"
+SELECTED_PAGE = "li.artdeco-pagination__indicator--number.selected"
+PAGE_CHANGE_JS = """prev => {
+    const s = document.querySelector('li.artdeco-pagination__indicator--number.selected');
+    return !!s && s.innerText.trim() !== prev
+        && document.querySelectorAll('.job-card-container').length > 0;
+}"""
+
+def count_cards(page):
+    return page.eval_on_selector_all('.job-card-container', "cards => cards.length")
+
+def wait_for_card_growth(page, previous_count, timeout=2000, fallback_ms=0):
+    """More job cards were rendered after a scroll step."""
+    return wait_for_condition(page, "card_growth", CARD_GROWTH_JS,
+                              arg=previous_count, timeout=timeout, fallback_ms=fallback_ms)
+
+def get_selected_page(page):
+    selected = page.query_selector(SELECTED_PAGE)
+    return selected.inner_text().strip() if selected else None
+
+def wait_for_page_change(page, previous_page, timeout=8000, fallback_ms=2000):
+    """Pagination indicator moved away from previous_page and cards are rendered."""
+    return wait_for_condition(page, "pagination", PAGE_CHANGE_JS,
+                              arg=previous_page, timeout=timeout, fallback_ms=fallback_ms)
+
+# async_api counterparts, same conditions and fallbacks
+
+async def count_cards_async(page):
+    return await page.eval_on_selector_all('.job-card-container', "cards => cards.length")
+
+async def wait_for_card_growth_async(page, previous_count, timeout=2000, fallback_ms=0):
+    return await wait_for_condition_async(page, "card_growth", CARD_GROWTH_JS,
+                                          arg=previous_count, timeout=timeout, fallback_ms=fallback_ms)
+
+async def get_selected_page_async(page):
+    selected = await page.query_selector(SELECTED_PAGE)
+    return (await selected.inner_text()).strip() if selected else None
+
+async def wait_for_page_change_async(page, previous_page, timeout=8000, fallback_ms=2000):
+    return await wait_for_condition_async(page, "pagination", PAGE_CHANGE_JS,
+                                          arg=previous_page, timeout=timeout, fallback_ms=fallback_ms)